@@ -2,8 +2,19 @@ from Car import Car
 from Truck import Truck
 from Motorcycle import Motorcycle
 import datetime
+import os
+import sys
 
-def file_to_rides_list(filename):
+# Общий для всех лабораторных код лежит в пакете common в корне репозитория
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.load_report import LoadReport
+
+def file_to_rides_list(filename, report=None):
+    # Без переданной сводки ошибки печатаются одной сводкой в конце
+    print_summary = report is None
+    if report is None:
+        report = LoadReport(language="en")
     rides = []
     
     with open(filename, "r", encoding='utf-8') as file:
@@ -42,13 +53,16 @@ def file_to_rides_list(filename):
                 elif ride_type == "Motorcycle":
                     rides.append(Motorcycle(date, plate, fuel))
                 else:
-                    print(f"Unknown transport type: {ride_type} in line {line_num}")
+                    raise ValueError(f"Unknown transport type: {ride_type}")
+                report.record_accepted()
                     
             except ValueError as e:
-                print(f"Error in line {line_num}: {e}. Line: '{line}'")
+                report.record_rejected(line_num, line, e)
             except Exception as e:
-                print(f"Unexpected error in line {line_num}: {e.__class__.__name__}: {e}. Line: '{line}'")
+                report.record_rejected(line_num, line, f"Unexpected error {e.__class__.__name__}: {e}")
     
+    if print_summary and report.rejected:
+        print(report.summary())
     return rides
 
 if __name__ == "__main__":
@@ -2,28 +2,45 @@ import datetime
 from models.Car import Car
 from models.Truck import Truck
 from models.Motorcycle import Motorcycle
+# The repository root (with the shared common package) is put on sys.path by main.py
+from common.compression import open_text_file
+from common.load_report import LoadReport
 
-def load_rides_from_file(filename):
+def load_rides_from_file(filename, report=None):
+    """Load rides; with a report (LoadReport(language="en")) bad lines are collected into it instead of raising."""
     rides = []
-    with open(filename, "r") as file:
-        for line in file:
-            parts = line.strip().split("(")
-            ride_type = parts[0]
-            values = parts[1].rstrip(")").split(", ")
-            date = datetime.datetime.strptime(values[0], "%d.%m.%Y")
-            plate = values[1][1:-1]
-            fuel = float(values[2])
-            has_spare = True if len(values) < 4 else values[3] == "True"
+    # With a report undecodable bytes are replaced, so such a line is rejected instead of aborting the load
+    with open_text_file(filename, "r", encoding=None, errors=None if report is None else "replace") as file:
+        for line_number, line in enumerate(file, 1):
+            try:
+                if "\ufffd" in line:
+                    raise ValueError("Line contains bytes that are not valid in the file encoding")
+                parts = line.strip().split("(")
+                ride_type = parts[0]
+                values = parts[1].rstrip(")").split(", ")
+                date = datetime.datetime.strptime(values[0], "%d.%m.%Y")
+                plate = values[1][1:-1]
+                fuel = float(values[2])
+                has_spare = True if len(values) < 4 else values[3] == "True"
 
-            if ride_type == "Car":
-                rides.append(Car(date, plate, fuel, has_spare))
-            elif ride_type == "Truck":
-                rides.append(Truck(date, plate, fuel, has_spare))
-            elif ride_type == "Motorcycle":
-                rides.append(Motorcycle(date, plate, fuel, has_spare))
+                if ride_type == "Car":
+                    rides.append(Car(date, plate, fuel, has_spare))
+                elif ride_type == "Truck":
+                    rides.append(Truck(date, plate, fuel, has_spare))
+                elif ride_type == "Motorcycle":
+                    rides.append(Motorcycle(date, plate, fuel, has_spare))
+                elif report is not None:
+                    raise ValueError(f"Unknown transport type: {ride_type}")
+            except (ValueError, IndexError) as e:
+                if report is None:
+                    raise
+                report.record_rejected(line_number, line.strip(), e)
+                continue
+            if report is not None:
+                report.record_accepted()
     return rides
 
 def save_rides_to_file(rides, filename):
-    with open(filename, "w") as file:
+    with open_text_file(filename, "w", encoding=None) as file:
         for ride in rides:
             file.write(f"{ride.__class__.__name__}({ride.date.strftime('%d.%m.%Y')}, \"{ride.license_plate}\", {ride.fuel_consumption}, {ride.has_spare_wheel})\n")
\ No newline at end of file
@@ -1,6 +1,12 @@
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
-from file_utils import load_rides_from_file, save_rides_to_file
+
+# Shared code of all labs lives in the common package at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_utils import LoadReport, load_rides_from_file, save_rides_to_file
 from models.Car import Car
 from models.Truck import Truck
 from models.Motorcycle import Motorcycle
@@ -14,9 +20,13 @@ class RideApp:
         self.root = root
         self.root.title("Fixation of Vehicle Passes")
 
-        self.rides = load_rides_from_file(FILENAME)
+        # Bad lines are skipped and summarized instead of aborting the whole load
+        report = LoadReport(language="en")
+        self.rides = load_rides_from_file(FILENAME, report)
         self.create_widgets()
         self.populate_table()
+        if report.rejected:
+            messagebox.showwarning("Warning", f"Some lines of {FILENAME} were skipped.\n{report.summary()}")
 
     def create_widgets(self):
         # Table
@@ -0,0 +1,120 @@
+import fcntl
+import os
+import threading
+from contextlib import contextmanager
+from CarPassBase import CarPassBase
+from file_utils import detect_compression
+
+class AppendWriter:
+    """
+    Класс для дозаписи записей о проездах в общий файл реестра
+
+    Записи накапливаются в буфере и фиксируются группами: на группу
+    выполняется одна запись под исключительной блокировкой fcntl и один
+    fsync. Файл открыт в режиме O_APPEND, а вся группа пишется под
+    блокировкой, поэтому строки разных процессов не перемешиваются.
+
+    В сжатый файл (.gz, .bz2, .xz) каждая группа дописывается отдельным
+    сжатым потоком: все три формата допускают склейку потоков, и при
+    чтении файл распаковывается как одно целое.
+    """
+
+    def __init__(self, filename: str, group_size: int = 256, sync: bool = True):
+        """
+        Открытие файла для дозаписи
+
+        Args:
+            filename (str): Путь к файлу реестра
+            group_size (int): Количество записей в группе
+            sync (bool): Выполнять fsync после каждой группы
+        """
+        self.filename = filename
+        self.group_size = group_size
+        self.sync = sync
+        self._buffer = []
+        self._lock = threading.RLock()
+        self._locked = False
+        # Формат непустого файла определяется по сигнатуре, нового или пустого - по расширению
+        self._compression = detect_compression(filename)
+        self._fd = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def write(self, product: CarPassBase) -> None:
+        """
+        Добавление записи в буфер; при заполнении группы она фиксируется
+
+        Args:
+            product (CarPassBase): Запись о проезде
+        """
+        with self._lock:
+            self._buffer.append(str(product) + "\n")
+            if len(self._buffer) >= self.group_size:
+                self._commit()
+
+    def write_many(self, products: list[CarPassBase]) -> None:
+        """
+        Добавление нескольких записей
+
+        Args:
+            products (list[CarPassBase]): Записи о проездах
+        """
+        for product in products:
+            self.write(product)
+
+    def flush(self) -> None:
+        """Фиксация накопленных записей"""
+        with self._lock:
+            self._commit()
+
+    @contextmanager
+    def lock(self):
+        """
+        Удержание блокировки файла на время нескольких операций
+
+        Группы, зафиксированные внутри блока, пишутся без повторной
+        блокировки, поэтому другие процессы не увидят файл между записью и
+        связанными с ней действиями (например, обновлением агрегатов).
+        """
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            self._locked = True
+            try:
+                yield self
+            finally:
+                self._locked = False
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Фиксация остатка буфера и закрытие файла"""
+        if self._fd is None:
+            return
+        self.flush()
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self) -> 'AppendWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _commit(self) -> None:
+        """Запись группы одним вызовом под блокировкой файла (вызывается под self._lock)"""
+        if not self._buffer:
+            return
+        data = "".join(self._buffer).encode('utf-8')
+        if self._compression is not None:
+            data = self._compression.compress(data)
+        data = memoryview(data)
+        if not self._locked:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            # os.write может записать данные частично; дописываем остаток, не снимая блокировку
+            while data:
+                written = os.write(self._fd, data)
+                data = data[written:]
+            if self.sync:
+                os.fsync(self._fd)
+        finally:
+            if not self._locked:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._buffer = []
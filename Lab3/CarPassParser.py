@@ -0,0 +1,83 @@
+import re
+import sys
+import datetime
+from CarPass import CarPass
+
+class CarPassParser:
+    """Класс для разбора и валидации строк файла реестра проездов"""
+
+    car_number_pattern = re.compile(r'^[АВЕКМНОРСТУХ]\d{3}[АВЕКМНОРСТУХ]{2}\d{2,3}$')
+    # Латинские буквы, похожие на допустимые кириллические, и строчные буквы приводятся к прописной кириллице
+    car_number_translation = str.maketrans(
+        "ABEKMHOPCTYXabekmhopctyx" + "абвгдеёжзийклмнопрстуфхцчшщъыьэюя",
+        "АВЕКМНОРСТУХ" * 2 + "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
+    )
+    def __init__(self, current_date: datetime.datetime | None = None):
+        """
+        Инициализация разборщика
+
+        Args:
+            current_date (datetime.datetime | None): Дата, позднее которой проезды считаются ошибочными
+                (по умолчанию текущий момент; он обновляется, если проезд кажется более поздним,
+                поэтому долго живущий разборщик принимает проезды после полуночи)
+        """
+        self._fixed_date = current_date is not None
+        self.current_date = current_date or datetime.datetime.now()
+
+    def normalize_car_number(self, car_number: str) -> str:
+        """
+        Приведение номера автомобиля к каноническому виду
+
+        Args:
+            car_number (str): Номер автомобиля в том виде, в котором его прислала камера
+
+        Returns:
+            str: Номер прописными кириллическими буквами
+        """
+        return car_number.strip().translate(self.car_number_translation)
+
+    def intern_car_number(self, car_number: str) -> str:
+        """
+        Получение единственного экземпляра строки номера
+
+        Используется таблица интернированных строк интерпретатора: номер
+        удаляется из неё, когда на него не остаётся ссылок, поэтому таблица
+        не растёт вместе с числом когда-либо встречавшихся номеров.
+
+        Args:
+            car_number (str): Проверенный номер автомобиля
+
+        Returns:
+            str: Строка номера, общая для всех проездов этого автомобиля
+        """
+        return sys.intern(car_number)
+
+    def parse_line(self, line: str) -> CarPass:
+        """
+        Разбор строки вида "ГГГГ-ММ-ДД,номер,расход"
+
+        Args:
+            line (str): Строка файла без символа перевода строки
+
+        Returns:
+            CarPass: Запись о проезде
+
+        Raises:
+            ValueError: Если строка не проходит валидацию
+        """
+        date_str, car_number, fuel_str = line.split(',')
+        # Валидация даты
+        pass_date = datetime.datetime.strptime(date_str, '%Y-%m-%d')
+        if pass_date > self.current_date and not self._fixed_date:
+            self.current_date = datetime.datetime.now()
+        if pass_date > self.current_date:
+            raise ValueError(f"Дата проезда позднее текущей: {date_str}")
+        # Валидация номера автомобиля
+        car_number = self.normalize_car_number(car_number)
+        if not self.car_number_pattern.match(car_number):
+            raise ValueError(f"Неверный формат номера автомобиля: {car_number}. Допустимы только буквы: А, В, Е, К, М, Н, О, Р, С, Т, У, Х")
+        # Валидация расхода топлива
+        fuel_consumption = float(fuel_str)
+        if fuel_consumption <= 0:
+            raise ValueError(f"Неверный расход топлива: {fuel_consumption}")
+        return CarPass(pass_date, self.intern_car_number(car_number), fuel_consumption)
@@ -0,0 +1,125 @@
+from bisect import bisect_right
+from CarPassBase import CarPassBase
+
+class CarPassVector:
+    """
+    Список записей о проездах с копированием при записи
+
+    Записи хранятся блоками по chunk_size элементов. Снимок (snapshot)
+    создаётся за O(1): он разделяет с исходным списком и оглавление
+    блоков, и сами блоки. При первом изменении после снимка копируется
+    только оглавление, а затем каждый изменяемый блок - при первой записи
+    в него, поэтому снимок никогда не меняется и его можно читать из
+    другого потока без блокировок.
+    """
+
+    chunk_size = 512
+
+    def __init__(self, products=()):
+        """
+        Инициализация списка
+
+        Args:
+            products: Начальные записи
+        """
+        self._chunks = []
+        # Индекс первого элемента каждого блока
+        self._starts = []
+        # Блоки, принадлежащие только этому списку (их можно менять на месте)
+        self._owned = []
+        self._shared = False
+        self._frozen = False
+        products = list(products)
+        for start in range(0, len(products), self.chunk_size):
+            self._chunks.append(products[start:start + self.chunk_size])
+            self._starts.append(start)
+            self._owned.append(True)
+        self._length = len(products)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> CarPassBase:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Индекс записи вне диапазона")
+        position = bisect_right(self._starts, index) - 1
+        return self._chunks[position][index - self._starts[position]]
+
+    def __iter__(self):
+        # Оглавление запоминается один раз: после изменения списка оно заменяется новым
+        for chunk in list(self._chunks):
+            yield from chunk
+
+    def __delitem__(self, index: int) -> None:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Индекс записи вне диапазона")
+        self._prepare_write()
+        position = bisect_right(self._starts, index) - 1
+        chunk = self._own_chunk(position)
+        del chunk[index - self._starts[position]]
+        if not chunk:
+            del self._chunks[position]
+            del self._starts[position]
+            del self._owned[position]
+        else:
+            position += 1
+        for i in range(position, len(self._starts)):
+            self._starts[i] -= 1
+        self._length -= 1
+
+    def append(self, product: CarPassBase) -> None:
+        """
+        Добавление записи в конец списка
+
+        Args:
+            product (CarPassBase): Запись о проезде
+        """
+        self._prepare_write()
+        if not self._chunks or len(self._chunks[-1]) >= self.chunk_size:
+            self._chunks.append([])
+            self._starts.append(self._length)
+            self._owned.append(True)
+        self._own_chunk(len(self._chunks) - 1).append(product)
+        self._length += 1
+
+    def copy(self) -> list[CarPassBase]:
+        """Получение обычного списка всех записей"""
+        return list(self)
+
+    def snapshot(self) -> 'CarPassVector':
+        """
+        Получение неизменяемого снимка текущего состояния за O(1)
+
+        Returns:
+            CarPassVector: Снимок, доступный только для чтения
+        """
+        snapshot = CarPassVector.__new__(CarPassVector)
+        snapshot._chunks = self._chunks
+        snapshot._starts = self._starts
+        snapshot._owned = None
+        snapshot._length = self._length
+        snapshot._shared = True
+        snapshot._frozen = True
+        self._shared = True
+        return snapshot
+
+    def _prepare_write(self) -> None:
+        """Проверка доступности изменения и отделение оглавления от снимков"""
+        if self._frozen:
+            raise TypeError("Снимок реестра доступен только для чтения")
+        if self._shared:
+            self._chunks = list(self._chunks)
+            self._starts = list(self._starts)
+            self._owned = [False] * len(self._chunks)
+            self._shared = False
+
+    def _own_chunk(self, position: int) -> list[CarPassBase]:
+        """Получение блока для записи; общий со снимками блок предварительно копируется"""
+        if not self._owned[position]:
+            self._chunks[position] = list(self._chunks[position])
+            self._owned[position] = True
+        return self._chunks[position]
@@ -0,0 +1,159 @@
+from math import fsum, sqrt
+from CarPassBase import CarPassBase
+
+class FuelAnomalyDetector:
+    """
+    Потоковый поиск аномального расхода топлива
+
+    Для каждого номера хранится скользящее окно последних значений расхода,
+    а также среднее и сумма квадратов отклонений от него, которые при сдвиге
+    окна обновляются по формулам Уэлфорда и раз в window записей
+    пересчитываются по самому окну. Поэтому среднее и отклонение стоят O(1)
+    на запись (в среднем), ошибка округления не накапливается, а память
+    ограничена O(число номеров * размер окна). Значение считается
+    аномальным, если оно отличается от среднего по окну больше чем на
+    threshold отклонений.
+
+    Для потока записей используйте update_many/check_many: они обрабатывают
+    пакет одним циклом без вызова метода на каждую запись.
+    """
+
+    def __init__(self, window: int = 20, threshold: float = 3.0, min_samples: int = 5,
+                 min_deviation: float = 0.5, logger=None, on_anomaly=None):
+        """
+        Инициализация детектора
+
+        Args:
+            window (int): Размер окна истории для каждого номера
+            threshold (float): Порог в стандартных отклонениях
+            min_samples (int): Сколько значений нужно накопить до первой проверки
+            min_deviation (float): Нижняя граница отклонения (л/100км), чтобы почти
+                постоянный расход не давал ложных срабатываний
+            logger (Logger): Логгер для записи аномалий, если on_anomaly не задан
+            on_anomaly: Функция on_anomaly(product, mean, deviation)
+        """
+        self.window = window
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.min_deviation = min_deviation
+        self.logger = logger
+        self.on_anomaly = on_anomaly
+        # номер -> [среднее, сумма квадратов отклонений, число значений, позиция старейшего
+        # значения в кольцевом буфере, кольцевой буфер окна]
+        self._states = {}
+
+    def reset(self) -> None:
+        """Сброс истории всех номеров (например, перед загрузкой другого файла)"""
+        self._states.clear()
+
+    def update(self, car_number: str, fuel_consumption: float) -> tuple[float, float] | None:
+        """
+        Учёт значения расхода и его проверка по истории номера
+
+        Args:
+            car_number (str): Номер автомобиля
+            fuel_consumption (float): Расход топлива
+
+        Returns:
+            tuple[float, float] | None: Среднее и отклонение по окну, если значение аномально
+        """
+        anomalies = self.update_many((car_number,), (fuel_consumption,))
+        return anomalies[0][1:] if anomalies else None
+
+    def update_many(self, car_numbers, fuel_values) -> list[tuple[int, float, float]]:
+        """
+        Учёт пакета значений расхода в порядке их следования
+
+        Args:
+            car_numbers: Номера автомобилей
+            fuel_values: Значения расхода топлива в том же порядке (последовательность с индексацией)
+
+        Returns:
+            list[tuple[int, float, float]]: Позиции аномальных значений в пакете,
+                среднее и отклонение по окну для каждого из них
+        """
+        states = self._states
+        get = states.get
+        window = self.window
+        min_samples = self.min_samples
+        # Сравнение квадратов избавляет от sqrt для неаномальных значений
+        threshold_sq = self.threshold * self.threshold
+        floor = self.min_deviation * self.min_deviation
+        anomalies = []
+        found = anomalies.append
+        for index, car_number in enumerate(car_numbers):
+            value = fuel_values[index]
+            state = get(car_number)
+            if state is None:
+                states[car_number] = [value, 0.0, 1, 0, [value]]
+                continue
+            mean, m2, count, oldest_position, values = state
+            if count >= min_samples:
+                delta = value - mean
+                variance = m2 / count
+                if delta * delta > threshold_sq * (variance if variance > floor else floor):
+                    found((index, mean, sqrt(variance if variance > floor else floor)))
+            if count == window:
+                # Сдвиг окна: самое старое значение заменяется новым
+                oldest = values[oldest_position]
+                values[oldest_position] = value
+                if oldest_position + 1 < window:
+                    state[3] = oldest_position + 1
+                    delta = value - oldest
+                    new_mean = mean + delta / window
+                    state[0] = new_mean
+                    state[1] = m2 + delta * (value - new_mean + oldest - mean)
+                else:
+                    # Раз в окно статистика пересчитывается по значениям окна, чтобы ошибка
+                    # округления не накапливалась (например, после резкой смены уровня расхода)
+                    state[3] = 0
+                    mean = fsum(values) / window
+                    state[0] = mean
+                    state[1] = fsum([(item - mean) ** 2 for item in values])
+            else:
+                values.append(value)
+                count += 1
+                delta = value - mean
+                mean += delta / count
+                state[0] = mean
+                state[1] = m2 + delta * (value - mean)
+                state[2] = count
+        return anomalies
+
+    def check(self, product: CarPassBase) -> bool:
+        """
+        Проверка записи о проезде с уведомлением об аномалии
+
+        Args:
+            product (CarPassBase): Запись о проезде
+
+        Returns:
+            bool: True, если расход аномален
+        """
+        return bool(self.check_many((product,)))
+
+    def check_many(self, products) -> list[CarPassBase]:
+        """
+        Проверка пакета записей о проездах с уведомлением о каждой аномалии
+
+        Args:
+            products: Записи о проездах в порядке их поступления
+
+        Returns:
+            list[CarPassBase]: Записи с аномальным расходом
+        """
+        anomalies = self.update_many([product.car_number for product in products],
+                                     [product.fuel_consumption for product in products])
+        found = []
+        for index, mean, deviation in anomalies:
+            product = products[index]
+            found.append(product)
+            if self.on_anomaly is not None:
+                self.on_anomaly(product, mean, deviation)
+            elif self.logger is not None:
+                self.logger.log_message("АНОМАЛИЯ", f"Необычный расход топлива: {product} "
+                                                    f"(среднее {mean:.2f}, отклонение {deviation:.2f})")
+        return found
+
+    def __len__(self) -> int:
+        return len(self._states)
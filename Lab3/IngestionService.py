@@ -0,0 +1,315 @@
+import argparse
+import asyncio
+import datetime
+import random
+import time
+from AppendWriter import AppendWriter
+from CarPassBase import CarPassBase
+from CarPassParser import CarPassParser
+
+class IngestionService:
+    """
+    Сервис приёма записей о проездах от камер по сети
+
+    Принимает по TCP (и, при необходимости, по UDP) строки вида
+    "ГГГГ-ММ-ДД,номер,расход", проверяет их теми же правилами, что и
+    загрузка файла, и пакетами передаёт в ProductManager и AppendWriter.
+    Очередь ограниченного размера обеспечивает обратное давление: пока
+    она заполнена, сервис перестаёт читать данные из TCP-соединений.
+    Ошибки разбора копятся и пишутся в лог пачками вне цикла событий.
+    """
+
+    # Максимальная длина строки события (ограничение буфера StreamReader)
+    line_limit = 64 * 1024
+
+    def __init__(self, product_manager, logger, writer: AppendWriter | None = None,
+                 batch_size: int = 256, queue_size: int = 10000):
+        """
+        Инициализация сервиса
+
+        Args:
+            product_manager (ProductManager | None): Менеджер записей или None, если записи
+                нужно только сохранять в файл
+            logger (Logger): Логгер для ошибок
+            writer (AppendWriter | None): Писатель для дозаписи в файл реестра
+            batch_size (int): Максимальный размер пакета записей
+            queue_size (int): Размер очереди принятых, но ещё не сохранённых записей
+        """
+        self.product_manager = product_manager
+        self.logger = logger
+        self.writer = writer
+        self.batch_size = batch_size
+        self.queue = asyncio.Queue(queue_size)
+        self.accepted = 0
+        self.rejected = 0
+        self.dropped = 0
+        self._servers = []
+        self._transports = []
+        self._consumer = None
+        self._pending_errors = []
+        self._log_futures = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, udp_port: int | None = None) -> int:
+        """
+        Запуск приёма соединений
+
+        Args:
+            host (str): Адрес для приёма
+            port (int): TCP-порт (0 - выбрать свободный)
+            udp_port (int | None): UDP-порт или None, чтобы не принимать UDP
+
+        Returns:
+            int: Фактический TCP-порт
+        """
+        self._consumer = asyncio.create_task(self._consume())
+        server = await asyncio.start_server(self._handle_connection, host, port, limit=self.line_limit)
+        self._servers.append(server)
+        if udp_port is not None:
+            transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: _DatagramProtocol(self), local_addr=(host, udp_port))
+            self._transports.append(transport)
+        return server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Остановка приёма и сохранение всех принятых записей"""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        for transport in self._transports:
+            transport.close()
+        await self.queue.join()
+        if self._consumer is not None:
+            self._consumer.cancel()
+        if self.writer is not None:
+            self.writer.flush()
+        self._flush_errors()
+        if self._log_futures:
+            await asyncio.gather(*self._log_futures)
+
+    def parse_event(self, line: str, parser: CarPassParser, source: str) -> CarPassBase:
+        """
+        Проверка одной строки события
+
+        Args:
+            line (str): Строка события
+            parser (CarPassParser): Разборщик строк
+            source (str): Описание источника для лога
+
+        Returns:
+            CarPassBase: Запись о проезде
+
+        Raises:
+            Exception: Ошибка разбора строки; она учитывается в счётчике
+                rejected и записывается в лог, а вызывающий отвечает клиенту ERR
+        """
+        try:
+            product = parser.parse_line(line)
+        except Exception as e:
+            self.rejected += 1
+            self._report_error(f"Не удалось разобрать событие от {source}: {line}. Ошибка: {str(e)}")
+            raise
+        self.accepted += 1
+        return product
+
+    def _report_error(self, message: str) -> None:
+        """Откладывание сообщения об ошибке до конца текущей итерации цикла событий"""
+        if not self._pending_errors:
+            asyncio.get_running_loop().call_soon(self._flush_errors)
+        self._pending_errors.append(message)
+
+    def _flush_errors(self) -> None:
+        """Запись накопленных ошибок в лог в пуле потоков, одной задачей на пачку"""
+        if not self._pending_errors:
+            return
+        messages, self._pending_errors = self._pending_errors, []
+        future = asyncio.get_running_loop().run_in_executor(None, self._log_errors, messages)
+        self._log_futures.add(future)
+        future.add_done_callback(self._log_futures.discard)
+
+    def _log_errors(self, messages: list[str]) -> None:
+        """Запись пачки сообщений в лог (вызывается вне цикла событий)"""
+        for message in messages:
+            self.logger.log_message("ОШИБКА", message)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обработка TCP-соединения: по ошибке на строку и итог при закрытии"""
+        source = "{}:{}".format(*writer.get_extra_info('peername')[:2])
+        # Разборщик сам обновляет текущую дату, поэтому долгое соединение принимает проезды после полуночи
+        parser = CarPassParser()
+        accepted = rejected = 0
+        line_number = 0
+        try:
+            async for raw_line in reader:
+                line = raw_line.decode('utf-8', errors='replace').strip()
+                if not line:
+                    continue
+                line_number += 1
+                try:
+                    product = self.parse_event(line, parser, source)
+                except Exception as e:
+                    rejected += 1
+                    writer.write(f"ERR {line_number} {str(e)}\n".encode('utf-8'))
+                    await writer.drain()
+                    continue
+                accepted += 1
+                await self.queue.put(product)
+            writer.write(f"DONE {accepted} {rejected}\n".encode('utf-8'))
+            await writer.drain()
+        except ValueError:
+            # StreamReader не может выделить строку длиннее буфера; соединение закрывается
+            self._report_error(f"Соединение с {source} закрыто: строка {line_number + 1} длиннее {self.line_limit} байт")
+            try:
+                writer.write(f"ERR {line_number + 1} Строка длиннее {self.line_limit} байт\n".encode('utf-8'))
+                await writer.drain()
+            except ConnectionError:
+                pass
+        except ConnectionError as e:
+            self._report_error(f"Соединение с {source} прервано: {str(e)}")
+        finally:
+            writer.close()
+
+    async def _consume(self) -> None:
+        """Передача принятых записей пакетами в менеджер и файл реестра"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                if self.product_manager is not None:
+                    for product in batch:
+                        try:
+                            self.product_manager.add_product(product)
+                        except Exception as e:
+                            self._report_error(f"Не удалось добавить запись {product}: {str(e)}")
+                if self.writer is not None:
+                    # Запись и fsync выполняются вне цикла событий, чтобы не блокировать приём
+                    await loop.run_in_executor(None, self._write_batch, batch)
+            except Exception as e:
+                # Ошибка не останавливает приём: иначе stop() ждал бы очередь вечно
+                self._report_error(f"Не удалось сохранить пакет из {len(batch)} записей: {str(e)}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _write_batch(self, batch: list[CarPassBase]) -> None:
+        """Фиксация пакета одной группой"""
+        self.writer.write_many(batch)
+        self.writer.flush()
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    """Приём событий по UDP; при переполнении очереди события отбрасываются"""
+
+    def __init__(self, service: IngestionService):
+        self.service = service
+        self.transport = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        parser = CarPassParser()
+        source = "{}:{}".format(*addr[:2])
+        for line_number, line in enumerate(data.decode('utf-8', errors='replace').splitlines(), 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                product = self.service.parse_event(line, parser, source)
+            except Exception as e:
+                self.transport.sendto(f"ERR {line_number} {str(e)}\n".encode('utf-8'), addr)
+                continue
+            try:
+                self.service.queue.put_nowait(product)
+            except asyncio.QueueFull:
+                self.service.dropped += 1
+                self.transport.sendto(f"DROP {line_number}\n".encode('utf-8'), addr)
+
+def generate_events(count: int, seed: int = 0) -> list[str]:
+    """
+    Генерация строк событий для нагрузочного клиента
+
+    Args:
+        count (int): Количество событий
+        seed (int): Начальное значение генератора случайных чисел
+
+    Returns:
+        list[str]: Строки событий без перевода строки
+    """
+    rng = random.Random(seed)
+    letters = "АВЕКМНОРСТУХ"
+    today = datetime.date.today()
+    return [f"{today - datetime.timedelta(days=rng.randint(0, 365))},"
+            f"{rng.choice(letters)}{rng.randint(0, 999):03d}{rng.choice(letters)}{rng.choice(letters)}{rng.randint(1, 199):02d},"
+            f"{rng.uniform(3.0, 20.0):.1f}" for _ in range(count)]
+
+async def send_events(host: str, port: int, events: list[str], chunk_size: int = 1000) -> list[str]:
+    """
+    Отправка событий по одному TCP-соединению
+
+    Args:
+        host (str): Адрес сервиса
+        port (int): TCP-порт сервиса
+        events (list[str]): Строки событий
+        chunk_size (int): Количество строк в одной отправке
+
+    Returns:
+        list[str]: Ответы сервиса (ошибки и итоговая строка DONE)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def read_replies() -> list[str]:
+        return [line.decode('utf-8').strip() async for line in reader]
+
+    replies = asyncio.create_task(read_replies())
+    for start in range(0, len(events), chunk_size):
+        writer.write(("\n".join(events[start:start + chunk_size]) + "\n").encode('utf-8'))
+        await writer.drain()
+    writer.write_eof()
+    result = await replies
+    writer.close()
+    return result
+
+async def generate_load(host: str, port: int, count: int, connections: int) -> float:
+    """
+    Нагрузочный клиент: отправка count событий по нескольким соединениям
+
+    Returns:
+        float: Достигнутая скорость, событий в секунду
+    """
+    events = generate_events(count)
+    share = (count + connections - 1) // connections
+    started = time.perf_counter()
+    await asyncio.gather(*(send_events(host, port, events[i * share:(i + 1) * share]) for i in range(connections)))
+    return count / (time.perf_counter() - started)
+
+async def serve(host: str, port: int, udp_port: int | None, output: str) -> None:
+    """Запуск сервиса до прерывания"""
+    from main import Logger
+    service = IngestionService(None, Logger(), AppendWriter(output))
+    port = await service.start(host, port, udp_port)
+    print(f"Приём событий на {host}:{port}, запись в {output}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Приём записей о проездах по сети")
+    commands = argument_parser.add_subparsers(dest="command", required=True)
+    serve_command = commands.add_parser("serve", help="запустить сервис")
+    serve_command.add_argument("--host", default="127.0.0.1")
+    serve_command.add_argument("--port", type=int, default=9000)
+    serve_command.add_argument("--udp-port", type=int)
+    serve_command.add_argument("--output", default="supply.txt")
+    load_command = commands.add_parser("load", help="нагрузочный клиент")
+    load_command.add_argument("--host", default="127.0.0.1")
+    load_command.add_argument("--port", type=int, default=9000)
+    load_command.add_argument("--count", type=int, default=100000)
+    load_command.add_argument("--connections", type=int, default=4)
+    arguments = argument_parser.parse_args()
+    if arguments.command == "serve":
+        asyncio.run(serve(arguments.host, arguments.port, arguments.udp_port, arguments.output))
+    else:
+        rate = asyncio.run(generate_load(arguments.host, arguments.port, arguments.count, arguments.connections))
+        print(f"Отправлено {arguments.count} событий, {rate:.0f} событий/с")
@@ -0,0 +1,233 @@
+import copy
+import threading
+from array import array
+from collections import OrderedDict
+from CarPass import CarPass
+from CarPassParser import CarPassParser
+from LoadReport import LoadReport
+
+class LazyCarPassList:
+    """
+    Ленивый список записей о проездах
+
+    При открытии файла запоминаются только смещения непустых строк; строка
+    разбирается и проверяется при первом обращении к ней, а результат
+    сохраняется в ограниченном кэше. Пока идёт фоновая проверка, невалидная
+    строка возвращается как None; после проверки невалидные строки
+    исключаются из индекса, и в списке остаются только записи.
+
+    Снимок (snapshot) разделяет с исходным списком индекс смещений, кэш и
+    открытый файл; индекс копируется только при первом изменении одного из
+    них после снимка.
+    """
+
+    def __init__(self, filename: str, parser: CarPassParser, logger, cache_size: int = 4096):
+        """
+        Инициализация списка и построение индекса смещений строк
+
+        Args:
+            filename (str): Путь к несжатому файлу реестра
+            parser (CarPassParser): Разборщик строк
+            logger (Logger): Логгер для сводки ошибок разбора
+            cache_size (int): Максимальное количество разобранных записей в кэше
+        """
+        self.filename = filename
+        self.parser = parser
+        self.logger = logger
+        self.cache_size = cache_size
+        self._offsets = array('q')
+        self._appended = []
+        self._cache = OrderedDict()
+        self._invalid_offsets = set()
+        self._shared = False
+        self._frozen = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.validation_finished = threading.Event()
+        # Сводка фоновой проверки; пишется в лог одной записью по её окончании
+        self.report = LoadReport()
+
+        # Индекс строится по тому же открытому файлу, из которого потом читаются строки:
+        # если реестр будет заменён на диске (например, сохранением в него же),
+        # список продолжит читать исходное содержимое
+        self._file = open(filename, 'rb')
+        offset = 0
+        for line in self._file:
+            if line.strip():
+                self._offsets.append(offset)
+            offset += len(line)
+
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._appended)
+
+    def __getitem__(self, index: int) -> CarPass | None:
+        """
+        Получение записи по индексу с разбором строки при первом обращении
+
+        Args:
+            index (int): Индекс записи
+
+        Returns:
+            CarPass | None: Запись или None, если строка файла невалидна
+        """
+        with self._lock:
+            # Индекс может быть заменён фоновой проверкой, поэтому читается под блокировкой
+            length = len(self._offsets) + len(self._appended)
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("Индекс записи вне диапазона")
+            if index >= len(self._offsets):
+                return self._appended[index - len(self._offsets)]
+            offset = self._offsets[index]
+            if offset in self._cache:
+                self._cache.move_to_end(offset)
+                return self._cache[offset]
+            self._file.seek(offset)
+            line = self._file.readline()
+        product = self._parse(offset, line)
+        with self._lock:
+            self._cache[offset] = product
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return product
+
+    def __delitem__(self, index: int) -> None:
+        with self._lock:
+            self._prepare_write()
+            if index < 0:
+                index += len(self)
+            if index >= len(self._offsets):
+                del self._appended[index - len(self._offsets)]
+            else:
+                del self._offsets[index]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, product: CarPass) -> None:
+        """
+        Добавление записи в конец списка (в файл она не записывается)
+
+        Args:
+            product (CarPass): Запись о проезде
+        """
+        with self._lock:
+            self._prepare_write()
+            self._appended.append(product)
+
+    def copy(self) -> list[CarPass]:
+        """Получение списка всех валидных записей (разбирает весь файл, минуя кэш)"""
+        with self._lock:
+            lines = []
+            for offset in self._offsets:
+                self._file.seek(offset)
+                lines.append((offset, self._file.readline()))
+            appended = list(self._appended)
+        products = []
+        for offset, line in lines:
+            product = self._parse(offset, line)
+            if product is not None:
+                products.append(product)
+        return products + appended
+
+    def snapshot(self) -> 'LazyCarPassList':
+        """
+        Получение неизменяемого снимка текущего состояния за O(1)
+
+        Снимок пользуется файлом исходного списка, поэтому закрывать его не нужно;
+        читать его можно, пока исходный список не закрыт.
+
+        Returns:
+            LazyCarPassList: Снимок, доступный только для чтения
+        """
+        with self._lock:
+            snapshot = copy.copy(self)
+            snapshot._frozen = True
+            snapshot._shared = self._shared = True
+        return snapshot
+
+    def _prepare_write(self) -> None:
+        """Проверка доступности изменения и отделение индекса от снимков"""
+        if self._frozen:
+            raise TypeError("Снимок реестра доступен только для чтения")
+        if self._shared:
+            self._offsets = array('q', self._offsets)
+            self._appended = list(self._appended)
+            self._shared = False
+
+    def start_validation(self) -> threading.Thread:
+        """
+        Запуск фоновой проверки всех строк файла; по её окончании невалидные
+        строки исключаются из списка, а сводка ошибок пишется в лог
+
+        Returns:
+            threading.Thread: Запущенный поток проверки
+        """
+        # Файл открывается сразу, чтобы проверялось то же содержимое, что и в индексе
+        file = open(self.filename, 'rb')
+        self._thread = threading.Thread(target=self._validate_all, args=(file,), daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def close(self) -> None:
+        """Остановка фоновой проверки и закрытие файла реестра"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        with self._lock:
+            self._file.close()
+
+    def _validate_all(self, file) -> None:
+        """Проход по всем строкам файла в фоновом потоке"""
+        # Смещения в индексе упорядочены по возрастанию, поэтому файл читается один раз подряд
+        offsets = array('q', self._offsets)
+        position = 0
+        offset = 0
+        try:
+            with file:
+                for line_number, line in enumerate(file, 1):
+                    if self._stop.is_set():
+                        return
+                    if position < len(offsets) and offsets[position] == offset:
+                        position += 1
+                        text = line.decode('utf-8', errors='replace').strip()
+                        try:
+                            self.parser.parse_line(text)
+                        except Exception as e:
+                            with self._lock:
+                                self._invalid_offsets.add(offset)
+                            self.report.record_rejected(line_number, text, e)
+                        else:
+                            self.report.record_accepted()
+                    offset += len(line)
+            with self._lock:
+                if self._invalid_offsets:
+                    # Новый массив, а не изменение на месте: снимки сохраняют свой индекс
+                    self._offsets = array('q', (offset for offset in self._offsets
+                                                if offset not in self._invalid_offsets))
+            if self.report.rejected:
+                self.logger.log_message("ОШИБКА", f"При проверке файла {self.filename} отклонены строки. {self.report.summary()}")
+        finally:
+            self.validation_finished.set()
+
+    def _parse(self, offset: int, line: bytes) -> CarPass | None:
+        """
+        Разбор строки файла при обращении; ошибки попадают в сводку фоновой проверки
+
+        Args:
+            offset (int): Смещение строки в файле
+            line (bytes): Содержимое строки
+
+        Returns:
+            CarPass | None: Запись или None при ошибке разбора
+        """
+        text = line.decode('utf-8', errors='replace').strip()
+        try:
+            return self.parser.parse_line(text)
+        except Exception:
+            with self._lock:
+                self._invalid_offsets.add(offset)
+            return None
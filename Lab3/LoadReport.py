@@ -0,0 +1 @@
+from file_utils import ErrorBudgetExceeded, LoadReport
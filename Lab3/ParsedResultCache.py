@@ -0,0 +1,254 @@
+import datetime
+import hashlib
+import json
+import os
+import sys
+import time
+from array import array
+from CarPass import CarPass
+from CarPassParser import CarPassParser
+from LoadReport import LoadReport
+
+class ParsedResultCache:
+    """
+    Дисковый кэш результатов разбора файлов реестра
+
+    Для каждого файла рядом с ним хранятся проверенные записи в виде
+    столбцов (порядковый номер даты, индекс номера в таблице номеров, расход
+    топлива) и отклонённые строки с ошибками. Запись кэша действительна, пока
+    совпадают размер и время изменения файла. Если они изменились, хэш
+    разобранной части файла сравнивается с сохранённым: при совпадении файл
+    только дописывался и разбирается лишь новая часть, иначе - заново целиком.
+
+    Файл кэша содержит контрольную сумму, заголовок JSON (сведения о файле,
+    таблица номеров и отклонённые строки) и байты столбцов array; исполняемых
+    данных в нём нет, поэтому подложенный рядом с реестром файл кэша может
+    лишь оказаться недействительным.
+
+    Размеры и время последнего использования всех файлов кэша учитываются в
+    общем индексе (directory/index.json). Если их суммарный размер превышает
+    max_bytes, давно не использованные файлы кэша удаляются.
+    """
+
+    version = 3
+    typecodes = ('i', 'I', 'd')
+    columns = ("ordinals", "plate_ids", "fuel")
+
+    def __init__(self, directory: str = ".parse_cache", max_bytes: int = 512 * 1024 * 1024):
+        """
+        Инициализация кэша
+
+        Args:
+            directory (str): Каталог индекса файлов кэша
+            max_bytes (int): Максимальный суммарный размер файлов кэша
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index_path = os.path.join(directory, "index.json")
+
+    @staticmethod
+    def side_filename(filename: str) -> str:
+        """
+        Получение пути к файлу кэша для файла реестра
+
+        Args:
+            filename (str): Путь к файлу реестра
+
+        Returns:
+            str: Путь к файлу кэша
+        """
+        return filename + ".parsed"
+
+    def load_products(self, filename: str, parser: CarPassParser, report: LoadReport) -> list[CarPass]:
+        """
+        Загрузка записей из кэша, с дозагрузкой дописанной части или с полным разбором
+
+        Args:
+            filename (str): Путь к несжатому файлу реестра
+            parser (CarPassParser): Разборщик строк
+            report (LoadReport): Сводка, в которую записываются отклонённые строки
+
+        Returns:
+            list[CarPass]: Список записей
+        """
+        stat = os.stat(filename)
+        entry = self._read_entry(filename)
+        digest = None
+        if entry is not None and (entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns):
+            digest = self._prefix_digest(filename, entry["offset"])
+            if digest is None or digest.hexdigest() != entry["hash"]:
+                entry = None
+
+        if entry is None or digest is not None:
+            # Новый или изменённый файл разбирается целиком, дописанный - начиная с сохранённого смещения
+            if entry is None:
+                entry = {"version": self.version, "ordinals": array('i'), "plate_ids": array('I'),
+                         "fuel": array('d'), "plates": [], "rejected": array('q'), "rejected_lines": [],
+                         "errors": [], "offset": 0, "lines": 0}
+                digest = hashlib.sha256()
+            self._parse_from(filename, entry, parser, report, digest)
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self._write_entry(filename, entry)
+        else:
+            self._touch(filename)
+            for line_number, line, error in zip(entry["rejected"], entry["rejected_lines"], entry["errors"]):
+                report.record_rejected(line_number, line, error)
+
+        plates = entry["plates"]
+        fromordinal = datetime.datetime.fromordinal
+        products = [CarPass(fromordinal(ordinal), plates[plate_id], fuel)
+                    for ordinal, plate_id, fuel in zip(entry["ordinals"], entry["plate_ids"], entry["fuel"])]
+
+        # Последняя строка без перевода строки разбирается, но не кэшируется: её могут дописать
+        with open(filename, 'rb') as file:
+            file.seek(entry["offset"])
+            line = file.read().decode('utf-8', errors='replace').strip()
+        if line:
+            try:
+                products.append(parser.parse_line(line))
+            except Exception as e:
+                report.record_rejected(entry["lines"] + 1, line, e)
+        report.record_accepted(len(products))
+        return products
+
+    def _prefix_digest(self, filename: str, size: int):
+        """
+        Хэш начала файла [0, size) для проверки, что разобранная часть не изменилась
+
+        Returns:
+            Объект sha256 (его можно дополнить новыми строками) или None, если файл короче
+        """
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as file:
+            while size:
+                block = file.read(min(size, 1024 * 1024))
+                if not block:
+                    return None
+                digest.update(block)
+                size -= len(block)
+        return digest
+
+    def _parse_from(self, filename: str, entry: dict, parser: CarPassParser, report: LoadReport, digest) -> None:
+        """Разбор полностью записанных строк файла начиная со смещения entry["offset"]; digest дополняется ими"""
+        plate_ids = {plate: plate_id for plate_id, plate in enumerate(entry["plates"])}
+        offset = entry["offset"]
+        line_number = entry["lines"]
+        with open(filename, 'rb') as file:
+            file.seek(offset)
+            for raw_line in file:
+                if not raw_line.endswith(b"\n"):
+                    break
+                offset += len(raw_line)
+                line_number += 1
+                digest.update(raw_line)
+                line = raw_line.decode('utf-8', errors='replace').strip()
+                if not line:
+                    continue
+                try:
+                    product = parser.parse_line(line)
+                except Exception as e:
+                    entry["rejected"].append(line_number)
+                    entry["rejected_lines"].append(line)
+                    entry["errors"].append(str(e))
+                    report.record_rejected(line_number, line, e)
+                    continue
+                plate_id = plate_ids.get(product.car_number)
+                if plate_id is None:
+                    plate_id = plate_ids[product.car_number] = len(entry["plates"])
+                    entry["plates"].append(product.car_number)
+                entry["ordinals"].append(product.pass_date.toordinal())
+                entry["plate_ids"].append(plate_id)
+                entry["fuel"].append(product.fuel_consumption)
+        entry["offset"] = offset
+        entry["lines"] = line_number
+        entry["hash"] = digest.hexdigest()
+
+    def _read_entry(self, filename: str) -> dict | None:
+        """
+        Чтение записи кэша
+
+        Returns:
+            dict | None: Запись или None, если файла нет, контрольная сумма не совпадает
+                или он записан в другой версии формата (или на машине с другим порядком байт)
+        """
+        try:
+            with open(self.side_filename(filename), 'rb') as file:
+                checksum, payload = file.read().split(b"\n", 1)
+            if hashlib.sha256(payload).hexdigest().encode('ascii') != checksum:
+                return None
+            header, data = payload.split(b"\n", 1)
+            entry = json.loads(header.decode('utf-8'))
+            if entry.get("version") != self.version or entry.get("byteorder") != sys.byteorder:
+                return None
+            position = 0
+            for name, typecode, length in zip(self.columns, self.typecodes, entry["lengths"]):
+                column = array(typecode)
+                end = position + length * column.itemsize
+                column.frombytes(data[position:end])
+                entry[name] = column
+                position = end
+            if position != len(data) or any(len(entry[name]) != len(entry["fuel"]) for name in self.columns):
+                return None
+            entry["rejected"] = array('q', entry["rejected"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return entry
+
+    def _write_entry(self, filename: str, entry: dict) -> None:
+        """Сохранение записи кэша рядом с файлом реестра (кэш необязателен, ошибки записи пропускаются)"""
+        path = self.side_filename(filename)
+        header = {key: value for key, value in entry.items() if key not in self.columns}
+        header["rejected"] = list(entry["rejected"])
+        header["byteorder"] = sys.byteorder
+        header["lengths"] = [len(entry[name]) for name in self.columns]
+        payload = (json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n"
+                   + b"".join(entry[name].tobytes() for name in self.columns))
+        try:
+            with open(path + ".tmp", 'wb') as file:
+                file.write(hashlib.sha256(payload).hexdigest().encode('ascii') + b"\n" + payload)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            return
+        self._touch(filename)
+
+    def _touch(self, filename: str) -> None:
+        """
+        Отметка использования файла кэша в индексе и удаление давно не
+        использованных файлов при превышении max_bytes
+
+        Индекс перечитывается перед изменением, поэтому учитываются и файлы
+        кэша, записанные другими процессами; при одновременной записи индекса
+        отметка одного из процессов может потеряться, что лишь сдвигает очередь удаления.
+        """
+        path = os.path.abspath(self.side_filename(filename))
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            index = {}
+        # Файлы, удалённые вручную или вместе с реестром, в индексе не нужны
+        index = {key: item for key, item in index.items() if key != path and os.path.exists(key)}
+        try:
+            index[path] = {"bytes": os.path.getsize(path), "used": time.time_ns()}
+        except OSError:
+            pass
+        total = sum(item["bytes"] for item in index.values())
+        for key, item in sorted(index.items(), key=lambda pair: pair[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(key)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            del index[key]
+            total -= item["bytes"]
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._index_path + ".tmp", 'w', encoding='utf-8') as file:
+                json.dump(index, file, ensure_ascii=False)
+            os.replace(self._index_path + ".tmp", self._index_path)
+        except OSError:
+            pass
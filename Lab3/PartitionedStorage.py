@@ -0,0 +1,260 @@
+import argparse
+import datetime
+import itertools
+import json
+import os
+from CarPassBase import CarPassBase
+from CarPassParser import CarPassParser
+from file_utils import open_text_file
+from LoadReport import LoadReport
+
+class PartitionedStorage:
+    """
+    Хранилище реестра проездов, разбитое по дням или месяцам
+
+    Каждая секция - отдельный текстовый файл в каталоге хранилища. Файл
+    manifest.json содержит число строк и минимальную/максимальную дату
+    каждой секции, поэтому запрос за период открывает только секции,
+    пересекающиеся с этим периодом.
+
+    Для перенесённых файлов манифест хранит размер, время изменения и
+    число прочитанных строк, поэтому повторный перенос того же файла ничего
+    не добавляет, а перенос дописанного файла продолжается с новых строк.
+    """
+
+    manifest_name = "manifest.json"
+    granularities = ("day", "month")
+
+    def __init__(self, directory: str, granularity: str | None = None, logger=None):
+        """
+        Открытие хранилища; каталог создаётся только при первой записи
+
+        Args:
+            directory (str): Каталог хранилища
+            granularity (str | None): Размер секции: "day" или "month" (None - как в манифесте
+                существующего хранилища, для нового - "month")
+            logger (Logger): Логгер для ошибок разбора
+
+        Raises:
+            ValueError: Если размер секции неизвестен или не совпадает с манифестом
+        """
+        if granularity is not None and granularity not in self.granularities:
+            raise ValueError(f"Неизвестный размер секции: {granularity}")
+        self.directory = directory
+        self.logger = logger
+        manifest_path = os.path.join(directory, self.manifest_name)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+            if granularity is not None and granularity != manifest["granularity"]:
+                raise ValueError(f"Хранилище {directory} разбито по секциям \"{manifest['granularity']}\", а не \"{granularity}\"")
+            self.granularity = manifest["granularity"]
+            self.partitions = manifest["partitions"]
+            self.sources = manifest.get("sources", {})
+        else:
+            self.granularity = granularity or "month"
+            self.partitions = {}
+            self.sources = {}
+
+    @classmethod
+    def is_partitioned(cls, path: str) -> bool:
+        """
+        Проверка, является ли путь каталогом секционированного хранилища
+
+        Args:
+            path (str): Путь к файлу или каталогу
+
+        Returns:
+            bool: True, если в каталоге есть манифест
+        """
+        return os.path.isfile(os.path.join(path, cls.manifest_name))
+
+    def partition_key(self, pass_date: datetime.datetime) -> str:
+        """
+        Получение имени секции для даты проезда
+
+        Args:
+            pass_date (datetime.datetime): Дата проезда
+
+        Returns:
+            str: ГГГГ-ММ-ДД для секций по дням или ГГГГ-ММ для секций по месяцам
+        """
+        day = pass_date.date().isoformat()
+        return day if self.granularity == "day" else day[:7]
+
+    def append_products(self, products: list[CarPassBase]) -> None:
+        """
+        Дозапись записей в соответствующие секции
+
+        Args:
+            products (list[CarPassBase]): Записи о проездах
+        """
+        groups = {}
+        for product in products:
+            groups.setdefault(self.partition_key(product.pass_date), []).append(product)
+        for key, group in groups.items():
+            self._write_partition(key, group)
+        self._save_manifest()
+
+    def partitions_for(self, start: datetime.date | None = None, end: datetime.date | None = None) -> list[str]:
+        """
+        Выбор секций, пересекающихся с периодом
+
+        Args:
+            start (datetime.date | None): Начало периода включительно
+            end (datetime.date | None): Конец периода включительно
+
+        Returns:
+            list[str]: Имена секций в порядке дат
+        """
+        start_str = start.isoformat() if start else None
+        end_str = end.isoformat() if end else None
+        return [key for key, info in sorted(self.partitions.items())
+                if (end_str is None or info["min_date"] <= end_str)
+                and (start_str is None or info["max_date"] >= start_str)]
+
+    def load_products(self, start: datetime.date | None = None, end: datetime.date | None = None,
+                      report: LoadReport | None = None) -> list[CarPassBase]:
+        """
+        Загрузка записей за период; читаются только подходящие секции
+
+        Args:
+            start (datetime.date | None): Начало периода включительно
+            end (datetime.date | None): Конец периода включительно
+            report (LoadReport | None): Сводка для отклонённых строк; без неё сводка
+                пишется в лог одной записью
+
+        Returns:
+            list[CarPassBase]: Записи о проездах в порядке секций
+        """
+        log_summary = report is None
+        if report is None:
+            report = LoadReport()
+        parser = CarPassParser()
+        products = []
+        for key in self.partitions_for(start, end):
+            filename = os.path.join(self.directory, self.partitions[key]["file"])
+            with open(filename, 'r', encoding='utf-8') as file:
+                for line_number, line in enumerate(file, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        product = parser.parse_line(line)
+                    except Exception as e:
+                        report.record_rejected(line_number, f"{key}: {line}", e)
+                        continue
+                    day = product.pass_date.date()
+                    if (start is None or day >= start) and (end is None or day <= end):
+                        products.append(product)
+        report.record_accepted(len(products))
+        if log_summary and report.rejected and self.logger is not None:
+            self.logger.log_message("ОШИБКА", f"При загрузке хранилища {self.directory} отклонены строки. {report.summary()}")
+        return products
+
+    @classmethod
+    def migrate(cls, filename: str, directory: str, granularity: str | None = None, logger=None,
+                buffer_size: int = 100000, report: LoadReport | None = None) -> 'PartitionedStorage':
+        """
+        Перенос обычного файла реестра в секционированное хранилище за один проход
+
+        Строки читаются потоково; в памяти держится не более buffer_size
+        записей, после чего они дописываются в свои секции, а в манифест
+        записывается число прочитанных строк файла. Повторный перенос
+        неизменённого файла ничего не делает; если файл с тех пор дописан
+        (или перенос был прерван), переносятся только непрочитанные строки.
+        Последняя строка без перевода строки (файл ещё дописывается) не
+        переносится и не учитывается в манифесте, пока её не допишут.
+
+        Args:
+            filename (str): Путь к файлу реестра (может быть сжатым)
+            directory (str): Каталог хранилища
+            granularity (str | None): Размер секции: "day" или "month" (None - как в манифесте,
+                для нового хранилища - "month")
+            logger (Logger): Логгер для сводки ошибок разбора
+            buffer_size (int): Количество записей, накапливаемых перед записью на диск
+            report (LoadReport | None): Сводка для отклонённых строк; без неё сводка
+                пишется в лог одной записью
+
+        Returns:
+            PartitionedStorage: Заполненное хранилище
+
+        Raises:
+            ValueError: Если размер секции не совпадает с манифестом или файл уже
+                переносился, но с тех пор уменьшился (был перезаписан)
+        """
+        storage = cls(directory, granularity, logger)
+        stat = os.stat(filename)
+        source_key = os.path.abspath(filename)
+        source = storage.sources.get(source_key, {"size": 0, "mtime_ns": None, "lines": 0})
+        if source["size"] == stat.st_size and source["mtime_ns"] == stat.st_mtime_ns:
+            return storage
+        if stat.st_size < source["size"]:
+            raise ValueError(f"Файл {filename} изменился после переноса в хранилище {directory}")
+        log_summary = report is None
+        if report is None:
+            report = LoadReport()
+        parser = CarPassParser()
+        buffer = []
+        line_number = skipped = source["lines"]
+
+        def flush() -> None:
+            # Сведения об источнике сохраняются вместе с секциями в одном манифесте
+            storage.sources[source_key] = dict(source, lines=line_number)
+            storage.append_products(buffer)
+            report.record_accepted(len(buffer))
+            buffer.clear()
+
+        with open_text_file(filename, 'r') as file:
+            for _ in itertools.islice(file, skipped):
+                pass
+            for line in file:
+                if not line.endswith("\n"):
+                    break
+                line_number += 1
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    buffer.append(parser.parse_line(line))
+                except Exception as e:
+                    report.record_rejected(line_number, line, e)
+                    continue
+                if len(buffer) >= buffer_size:
+                    flush()
+        source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        flush()
+        if log_summary and report.rejected and logger is not None:
+            logger.log_message("ОШИБКА", f"При переносе файла {filename} отклонены строки. {report.summary()}")
+        return storage
+
+    def _write_partition(self, key: str, products: list[CarPassBase]) -> None:
+        """Дозапись группы записей в файл секции и обновление её сведений в манифесте"""
+        os.makedirs(self.directory, exist_ok=True)
+        info = self.partitions.setdefault(key, {"file": key + ".txt", "rows": 0, "min_date": None, "max_date": None})
+        days = [product.pass_date.date().isoformat() for product in products]
+        with open(os.path.join(self.directory, info["file"]), 'a', encoding='utf-8') as file:
+            file.write("".join(str(product) + "\n" for product in products))
+        info["rows"] += len(products)
+        info["min_date"] = min(days + ([info["min_date"]] if info["min_date"] else []))
+        info["max_date"] = max(days + ([info["max_date"]] if info["max_date"] else []))
+
+    def _save_manifest(self) -> None:
+        """Атомарная запись манифеста"""
+        os.makedirs(self.directory, exist_ok=True)
+        manifest_path = os.path.join(self.directory, self.manifest_name)
+        with open(manifest_path + ".tmp", 'w', encoding='utf-8') as file:
+            json.dump({"granularity": self.granularity, "partitions": self.partitions, "sources": self.sources},
+                      file, ensure_ascii=False, indent=1)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Перенос файла реестра в секционированное хранилище")
+    argument_parser.add_argument("filename", help="файл реестра")
+    argument_parser.add_argument("directory", help="каталог хранилища")
+    argument_parser.add_argument("--granularity", choices=PartitionedStorage.granularities)
+    arguments = argument_parser.parse_args()
+    from main import Logger
+    storage = PartitionedStorage.migrate(arguments.filename, arguments.directory, arguments.granularity, Logger())
+    rows = sum(info["rows"] for info in storage.partitions.values())
+    print(f"Перенесено записей: {rows}, секций: {len(storage.partitions)}")
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+from CarPassBase import CarPassBase
+
+class PassRollups:
+    """
+    Класс для агрегатов по реестру проездов: число проездов по дням и
+    число проездов и суммарный расход топлива по каждому номеру за месяц
+
+    Агрегаты хранятся в файле рядом с файлом реестра вместе с контрольной
+    суммой и размером/временем изменения реестра, поэтому отчёт за месяц
+    не требует чтения всего реестра. В файле заголовок (счётчики по дням и
+    список месяцев) и по одной строке на месяц; при загрузке разбирается
+    только заголовок, а строка месяца - при первом обращении к нему.
+    Несколько новых записей за текущий месяц меняют при сохранении только
+    его строку, остальные месяцы переписываются без разбора.
+    """
+
+    version = 2
+
+    def __init__(self):
+        """Инициализация пустых агрегатов"""
+        self.daily = {}
+        # Разобранные месяцы: номер -> [число проездов, суммарный расход]
+        self.monthly = {}
+        # Ещё не разобранные строки месяцев из файла агрегатов
+        self._raw_months = {}
+
+    @staticmethod
+    def side_filename(filename: str) -> str:
+        """
+        Получение пути к файлу агрегатов для файла реестра
+
+        Args:
+            filename (str): Путь к файлу реестра
+
+        Returns:
+            str: Путь к файлу агрегатов
+        """
+        return filename + ".rollup"
+
+    @classmethod
+    def from_products(cls, products: list[CarPassBase]) -> 'PassRollups':
+        """
+        Построение агрегатов по списку записей
+
+        Args:
+            products (list[CarPassBase]): Записи о проездах
+
+        Returns:
+            PassRollups: Агрегаты
+        """
+        rollups = cls()
+        for product in products:
+            rollups.add(product)
+        return rollups
+
+    def add(self, product: CarPassBase) -> None:
+        """
+        Учёт новой записи о проезде
+
+        Args:
+            product (CarPassBase): Запись о проезде
+        """
+        day = product.pass_date.date().isoformat()
+        self.daily[day] = self.daily.get(day, 0) + 1
+        plates = self._month(day[:7], create=True)
+        totals = plates.setdefault(product.car_number, [0, 0.0])
+        totals[0] += 1
+        totals[1] += product.fuel_consumption
+
+    def remove(self, product: CarPassBase) -> None:
+        """
+        Исключение удалённой записи о проезде
+
+        Args:
+            product (CarPassBase): Запись о проезде
+        """
+        day = product.pass_date.date().isoformat()
+        if day not in self.daily:
+            return
+        self.daily[day] -= 1
+        if self.daily[day] <= 0:
+            del self.daily[day]
+        plates = self._month(day[:7]) or {}
+        totals = plates.get(product.car_number)
+        if totals is None:
+            return
+        totals[0] -= 1
+        totals[1] -= product.fuel_consumption
+        if totals[0] <= 0:
+            del plates[product.car_number]
+            if not plates:
+                del self.monthly[day[:7]]
+
+    def daily_passes(self, day: str) -> int:
+        """
+        Получение числа проездов за день
+
+        Args:
+            day (str): Дата в формате ГГГГ-ММ-ДД
+
+        Returns:
+            int: Число проездов
+        """
+        return self.daily.get(day, 0)
+
+    def monthly_report(self, month: str) -> dict[str, tuple[int, float]]:
+        """
+        Получение отчёта за месяц по номерам автомобилей
+
+        Args:
+            month (str): Месяц в формате ГГГГ-ММ
+
+        Returns:
+            dict[str, tuple[int, float]]: Число проездов и суммарный расход топлива по номерам
+        """
+        return {car_number: (count, round(fuel, 6))
+                for car_number, (count, fuel) in (self._month(month) or {}).items()}
+
+    def _month(self, month: str, create: bool = False) -> dict | None:
+        """
+        Получение агрегатов месяца с разбором его строки при первом обращении
+
+        Args:
+            month (str): Месяц в формате ГГГГ-ММ
+            create (bool): Создать пустые агрегаты, если месяца ещё нет
+
+        Returns:
+            dict | None: Число проездов и расход по номерам или None
+        """
+        raw = self._raw_months.pop(month, None)
+        if raw is not None:
+            self.monthly[month] = json.loads(raw)
+        if create:
+            return self.monthly.setdefault(month, {})
+        return self.monthly.get(month)
+
+    def save(self, filename: str) -> None:
+        """
+        Сохранение агрегатов рядом с файлом реестра
+
+        Args:
+            filename (str): Путь к файлу реестра (должен уже существовать)
+        """
+        stat = os.stat(filename)
+        # Неизменённые месяцы записываются как были; расход округляется, чтобы не хранить
+        # накопленный шум чисел с плавающей точкой
+        months = dict(self._raw_months)
+        for month, plates in self.monthly.items():
+            months[month] = json.dumps({car_number: [count, round(fuel, 6)]
+                                        for car_number, (count, fuel) in plates.items()},
+                                       ensure_ascii=False, separators=(',', ':'))
+        header = json.dumps({
+            "version": self.version,
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "daily": self.daily,
+            "months": sorted(months),
+        }, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        payload = "\n".join([header] + [months[month] for month in sorted(months)])
+        checksum = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        side_filename = self.side_filename(filename)
+        with open(side_filename + ".tmp", 'w', encoding='utf-8') as file:
+            file.write(checksum + "\n" + payload)
+        os.replace(side_filename + ".tmp", side_filename)
+
+    @classmethod
+    def load(cls, filename: str) -> 'PassRollups | None':
+        """
+        Загрузка агрегатов для файла реестра
+
+        Args:
+            filename (str): Путь к файлу реестра
+
+        Returns:
+            PassRollups | None: Агрегаты или None, если файла агрегатов нет, его контрольная
+                сумма не совпадает или реестр изменился после сохранения агрегатов
+        """
+        try:
+            with open(cls.side_filename(filename), 'r', encoding='utf-8') as file:
+                checksum, payload = file.read().split("\n", 1)
+            stat = os.stat(filename)
+        except (OSError, ValueError):
+            return None
+        if hashlib.sha256(payload.encode('utf-8')).hexdigest() != checksum:
+            return None
+        header, *lines = payload.split("\n")
+        data = json.loads(header)
+        if data.get("version") != cls.version or len(lines) != len(data["months"]):
+            return None
+        if data["source_size"] != stat.st_size or data["source_mtime_ns"] != stat.st_mtime_ns:
+            return None
+        rollups = cls()
+        rollups.daily = data["daily"]
+        rollups._raw_months = dict(zip(data["months"], lines))
+        return rollups
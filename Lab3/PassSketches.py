@@ -0,0 +1,485 @@
+import argparse
+import base64
+import hashlib
+import heapq
+import json
+import math
+import os
+from array import array
+from CarPassBase import CarPassBase
+from CarPassParser import CarPassParser
+from file_utils import open_text_file
+from LoadReport import LoadReport
+
+def plate_hash(car_number: str) -> int:
+    """
+    64-битный хэш номера, одинаковый во всех процессах (в отличие от hash())
+
+    Args:
+        car_number (str): Номер автомобиля
+
+    Returns:
+        int: Хэш номера
+    """
+    return int.from_bytes(hashlib.blake2b(car_number.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class HyperLogLog:
+    """
+    Оценка числа различных номеров (HyperLogLog)
+
+    Занимает 2^precision байт независимо от числа номеров; стандартная
+    относительная ошибка оценки 1.04 / sqrt(2^precision), то есть около
+    1.6% при precision = 12 (4 КБ). Два счётчика с одинаковой точностью
+    объединяются поэлементным максимумом регистров.
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        Инициализация пустого счётчика
+
+        Args:
+            precision (int): Число бит хэша для выбора регистра (от 4 до 16)
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError(f"Недопустимая точность HyperLogLog: {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add_hash(self, value: int) -> None:
+        """
+        Учёт элемента по его 64-битному хэшу
+
+        Args:
+            value (int): Хэш элемента (см. plate_hash)
+        """
+        rest_bits = 64 - self.precision
+        index = value >> rest_bits
+        rest = value & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, car_number: str) -> None:
+        """
+        Учёт номера
+
+        Args:
+            car_number (str): Номер автомобиля
+        """
+        self.add_hash(plate_hash(car_number))
+
+    def count(self) -> int:
+        """
+        Оценка числа различных учтённых номеров
+
+        Returns:
+            int: Оценка числа различных номеров
+        """
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        # Для малых множеств точнее оценка по числу пустых регистров
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """
+        Объединение с другим счётчиком той же точности
+
+        Args:
+            other (HyperLogLog): Счётчик, например, по другому файлу
+        """
+        if other.precision != self.precision:
+            raise ValueError("Нельзя объединить счётчики HyperLogLog разной точности")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def to_dict(self) -> dict:
+        """Представление для сохранения в JSON"""
+        return {"precision": self.precision, "registers": base64.b64encode(self.registers).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'HyperLogLog':
+        """Восстановление из представления to_dict"""
+        sketch = cls(data["precision"])
+        sketch.registers = bytearray(base64.b64decode(data["registers"]))
+        return sketch
+
+class CountMinSketch:
+    """
+    Оценка числа проездов по номеру (Count-Min)
+
+    Таблица depth x width счётчиков фиксированного размера. Оценка никогда
+    не меньше точного значения и с вероятностью не ниже 1 - e^-depth
+    превышает его не более чем на e / width * N, где N - общее число
+    учтённых проездов. Таблицы одинакового размера объединяются сложением.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        """
+        Инициализация пустой таблицы
+
+        Args:
+            width (int): Число счётчиков в строке
+            depth (int): Число строк (независимых хэш-функций)
+        """
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.counters = array('Q', bytes(8 * width * depth))
+
+    def _positions(self, value: int) -> list[int]:
+        """Позиции счётчиков номера по строкам (двойное хэширование)"""
+        first = value & 0xFFFFFFFF
+        second = (value >> 32) | 1
+        return [row * self.width + (first + row * second) % self.width for row in range(self.depth)]
+
+    def add_hash(self, value: int, count: int = 1) -> int:
+        """
+        Учёт проездов по хэшу номера
+
+        Args:
+            value (int): Хэш номера (см. plate_hash)
+            count (int): Число проездов
+
+        Returns:
+            int: Новая оценка числа проездов номера
+        """
+        self.total += count
+        counters = self.counters
+        estimate = None
+        for position in self._positions(value):
+            counters[position] += count
+            if estimate is None or counters[position] < estimate:
+                estimate = counters[position]
+        return estimate
+
+    def estimate_hash(self, value: int) -> int:
+        """Оценка числа проездов по хэшу номера"""
+        return min(self.counters[position] for position in self._positions(value))
+
+    def add(self, car_number: str, count: int = 1) -> int:
+        """
+        Учёт проездов номера
+
+        Args:
+            car_number (str): Номер автомобиля
+            count (int): Число проездов
+
+        Returns:
+            int: Новая оценка числа проездов номера
+        """
+        return self.add_hash(plate_hash(car_number), count)
+
+    def estimate(self, car_number: str) -> int:
+        """
+        Оценка числа проездов номера
+
+        Args:
+            car_number (str): Номер автомобиля
+
+        Returns:
+            int: Оценка сверху числа проездов
+        """
+        return self.estimate_hash(plate_hash(car_number))
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        """
+        Объединение с таблицей того же размера
+
+        Args:
+            other (CountMinSketch): Таблица, например, по другому файлу
+        """
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Нельзя объединить таблицы Count-Min разного размера")
+        self.counters = array('Q', map(sum, zip(self.counters, other.counters)))
+        self.total += other.total
+
+    def to_dict(self) -> dict:
+        """Представление для сохранения в JSON"""
+        return {"width": self.width, "depth": self.depth, "total": self.total,
+                "counters": base64.b64encode(self.counters.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CountMinSketch':
+        """Восстановление из представления to_dict"""
+        sketch = cls(data["width"], data["depth"])
+        sketch.total = data["total"]
+        sketch.counters = array('Q')
+        sketch.counters.frombytes(base64.b64decode(data["counters"]))
+        return sketch
+
+class PassSketches:
+    """
+    Вероятностные сводки по реестру проездов фиксированного размера
+
+    Для каждого дня хранится счётчик HyperLogLog различных номеров, для
+    всего реестра - таблица Count-Min и k номеров с наибольшей оценкой
+    числа проездов (куча с ленивым удалением устаревших оценок). Память
+    не зависит от числа номеров: 2^precision байт на день и
+    8 * width * depth байт на таблицу. Сводки пополняются через add
+    (подходит как обработчик record_hooks), объединяются методом merge и
+    сохраняются рядом с файлом реестра, как агрегаты PassRollups.
+
+    Удаление записей не поддерживается: после удаления сводки нужно
+    построить заново.
+    """
+
+    def __init__(self, precision: int = 12, width: int = 2048, depth: int = 4, top_k: int = 20):
+        """
+        Инициализация пустых сводок
+
+        Args:
+            precision (int): Точность счётчиков HyperLogLog
+            width (int): Ширина таблицы Count-Min
+            depth (int): Глубина таблицы Count-Min
+            top_k (int): Сколько самых частых номеров отслеживать
+        """
+        self.precision = precision
+        self.top_k = top_k
+        self.daily = {}
+        self.counts = CountMinSketch(width, depth)
+        # номер -> текущая оценка для номеров из числа самых частых
+        self.top = {}
+        self._heap = []
+
+    @staticmethod
+    def side_filename(filename: str) -> str:
+        """
+        Получение пути к файлу сводок для файла реестра
+
+        Args:
+            filename (str): Путь к файлу реестра
+
+        Returns:
+            str: Путь к файлу сводок
+        """
+        return filename + ".sketch"
+
+    def add(self, product: CarPassBase) -> None:
+        """
+        Учёт записи о проезде
+
+        Args:
+            product (CarPassBase): Запись о проезде
+        """
+        value = plate_hash(product.car_number)
+        day = product.pass_date.date().isoformat()
+        sketch = self.daily.get(day)
+        if sketch is None:
+            sketch = self.daily[day] = HyperLogLog(self.precision)
+        sketch.add_hash(value)
+        self._offer(product.car_number, self.counts.add_hash(value))
+
+    def _offer(self, car_number: str, estimate: int) -> None:
+        """Обновление списка самых частых номеров новой оценкой номера"""
+        if car_number in self.top:
+            self.top[car_number] = estimate
+        elif len(self.top) < self.top_k:
+            self.top[car_number] = estimate
+        else:
+            # Вершина кучи может быть устаревшей: оценки номеров только растут
+            while self._heap and self.top.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            if not self._heap or estimate <= self._heap[0][0]:
+                return
+            del self.top[heapq.heappop(self._heap)[1]]
+            self.top[car_number] = estimate
+        heapq.heappush(self._heap, (estimate, car_number))
+        if len(self._heap) > 4 * self.top_k:
+            self._heap = [(count, plate) for plate, count in self.top.items()]
+            heapq.heapify(self._heap)
+
+    def distinct_cars(self, day: str) -> int:
+        """
+        Оценка числа различных автомобилей за день
+
+        Args:
+            day (str): Дата в формате ГГГГ-ММ-ДД
+
+        Returns:
+            int: Оценка числа различных номеров
+        """
+        sketch = self.daily.get(day)
+        return sketch.count() if sketch is not None else 0
+
+    def distinct_cars_between(self, start: str, end: str) -> int:
+        """
+        Оценка числа различных автомобилей за период (объединением дневных счётчиков)
+
+        Args:
+            start (str): Начало периода ГГГГ-ММ-ДД включительно
+            end (str): Конец периода ГГГГ-ММ-ДД включительно
+
+        Returns:
+            int: Оценка числа различных номеров
+        """
+        total = HyperLogLog(self.precision)
+        for day, sketch in self.daily.items():
+            if start <= day <= end:
+                total.merge(sketch)
+        return total.count()
+
+    def passes(self, car_number: str) -> int:
+        """
+        Оценка сверху числа проездов номера
+
+        Args:
+            car_number (str): Номер автомобиля
+
+        Returns:
+            int: Оценка числа проездов
+        """
+        return self.counts.estimate(car_number)
+
+    def heavy_hitters(self, limit: int | None = None) -> list[tuple[str, int]]:
+        """
+        Самые частые номера
+
+        Args:
+            limit (int | None): Максимальное количество номеров (не больше top_k)
+
+        Returns:
+            list[tuple[str, int]]: Номера и оценки числа проездов по убыванию
+        """
+        result = sorted(self.top.items(), key=lambda item: (-item[1], item[0]))
+        return result[:limit] if limit is not None else result
+
+    def merge(self, other: 'PassSketches') -> None:
+        """
+        Объединение со сводками по другому файлу или процессу
+
+        Кандидатами в самые частые номера служат только номера из списков
+        top обеих сводок; их оценки пересчитываются по объединённой таблице
+        Count-Min. Номер, не попавший ни в один из списков, в результат не
+        войдёт, хотя его число проездов может достигать суммы наименьших
+        оценок в полных (k номеров) списках top двух сводок: в каждой сводке
+        его оценка не больше наименьшей оценки её списка. Поэтому найдены
+        все номера, у которых проездов больше этой суммы, а оценка каждого
+        найденного номера, как и любая оценка Count-Min, завышена не более
+        чем на e / width * N с вероятностью не ниже 1 - e^-depth.
+
+        Args:
+            other (PassSketches): Сводки с теми же параметрами
+        """
+        for day, sketch in other.daily.items():
+            if day in self.daily:
+                self.daily[day].merge(sketch)
+            else:
+                self.daily[day] = HyperLogLog(sketch.precision)
+                self.daily[day].registers = bytearray(sketch.registers)
+        self.counts.merge(other.counts)
+        candidates = set(self.top) | set(other.top)
+        estimates = sorted(((self.counts.estimate(plate), plate) for plate in candidates), reverse=True)
+        self.top = {plate: count for count, plate in estimates[:self.top_k]}
+        self._heap = [(count, plate) for plate, count in self.top.items()]
+        heapq.heapify(self._heap)
+
+    def to_dict(self) -> dict:
+        """Представление для сохранения в JSON"""
+        return {"precision": self.precision, "top_k": self.top_k,
+                "daily": {day: sketch.to_dict() for day, sketch in self.daily.items()},
+                "counts": self.counts.to_dict(), "top": self.top}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PassSketches':
+        """Восстановление из представления to_dict"""
+        counts = CountMinSketch.from_dict(data["counts"])
+        sketches = cls(data["precision"], counts.width, counts.depth, data["top_k"])
+        sketches.counts = counts
+        sketches.daily = {day: HyperLogLog.from_dict(sketch) for day, sketch in data["daily"].items()}
+        sketches.top = data["top"]
+        sketches._heap = [(count, plate) for plate, count in sketches.top.items()]
+        heapq.heapify(sketches._heap)
+        return sketches
+
+    def save(self, filename: str) -> None:
+        """
+        Сохранение сводок рядом с файлом реестра
+
+        Args:
+            filename (str): Путь к файлу реестра (должен уже существовать)
+        """
+        stat = os.stat(filename)
+        payload = json.dumps({
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "sketches": self.to_dict(),
+        }, ensure_ascii=False, sort_keys=True)
+        checksum = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        side_filename = self.side_filename(filename)
+        with open(side_filename + ".tmp", 'w', encoding='utf-8') as file:
+            file.write(checksum + "\n" + payload)
+        os.replace(side_filename + ".tmp", side_filename)
+
+    @classmethod
+    def load(cls, filename: str) -> 'PassSketches | None':
+        """
+        Загрузка сводок для файла реестра
+
+        Args:
+            filename (str): Путь к файлу реестра
+
+        Returns:
+            PassSketches | None: Сводки или None, если файла сводок нет, его контрольная
+                сумма не совпадает или реестр изменился после сохранения сводок
+        """
+        try:
+            with open(cls.side_filename(filename), 'r', encoding='utf-8') as file:
+                checksum, payload = file.read().split("\n", 1)
+            stat = os.stat(filename)
+        except (OSError, ValueError):
+            return None
+        if hashlib.sha256(payload.encode('utf-8')).hexdigest() != checksum:
+            return None
+        data = json.loads(payload)
+        if data["source_size"] != stat.st_size or data["source_mtime_ns"] != stat.st_mtime_ns:
+            return None
+        return cls.from_dict(data["sketches"])
+
+    @classmethod
+    def from_file(cls, filename: str, report: LoadReport | None = None, **parameters) -> 'PassSketches':
+        """
+        Потоковое построение сводок по файлу реестра без хранения записей
+
+        Args:
+            filename (str): Путь к файлу реестра (может быть сжатым)
+            report (LoadReport | None): Сводка для отклонённых строк
+            **parameters: Параметры PassSketches
+
+        Returns:
+            PassSketches: Сводки
+        """
+        sketches = cls(**parameters)
+        report = report if report is not None else LoadReport()
+        parser = CarPassParser()
+        with open_text_file(filename, 'r') as file:
+            for line_number, line in enumerate(file, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    product = parser.parse_line(line)
+                except Exception as e:
+                    report.record_rejected(line_number, line, e)
+                    continue
+                sketches.add(product)
+                report.record_accepted()
+        return sketches
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Оценка числа различных автомобилей и самых частых номеров")
+    argument_parser.add_argument("files", nargs="+", help="файлы реестра")
+    argument_parser.add_argument("--top", type=int, default=10, help="сколько частых номеров показать")
+    arguments = argument_parser.parse_args()
+    total = PassSketches(top_k=max(20, arguments.top))
+    for filename in arguments.files:
+        sketches = PassSketches.load(filename)
+        if sketches is None:
+            sketches = PassSketches.from_file(filename, top_k=total.top_k)
+            sketches.save(filename)
+        total.merge(sketches)
+    for day in sorted(total.daily):
+        print(f"{day}: около {total.distinct_cars(day)} различных автомобилей")
+    for car_number, count in total.heavy_hitters(arguments.top):
+        print(f"{car_number}: около {count} проездов")
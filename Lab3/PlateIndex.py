@@ -0,0 +1,126 @@
+class PlateIndex:
+    """
+    Индекс различных номеров автомобилей для нечёткого поиска
+
+    Поиск номеров на расстоянии Левенштейна не более k (ошибки распознавания
+    камерой) основан на принципе Дирихле: номер делится на max_distance + 1
+    частей, и при k <= max_distance ошибках хотя бы одна часть встречается
+    в запросе без изменений со сдвигом не более k. Индекс хранит номера по
+    их частям, поэтому точное расстояние считается только для кандидатов,
+    а не для всех номеров реестра.
+    """
+
+    def __init__(self, max_distance: int = 2):
+        """
+        Инициализация пустого индекса
+
+        Args:
+            max_distance (int): Наибольшее расстояние, допустимое в запросах
+        """
+        self.max_distance = max_distance
+        self._counts = {}
+        self._pieces = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, car_number: str) -> bool:
+        return car_number in self._counts
+
+    def add(self, car_number: str) -> None:
+        """
+        Учёт проезда с номером
+
+        Args:
+            car_number (str): Номер автомобиля
+        """
+        count = self._counts.get(car_number, 0)
+        self._counts[car_number] = count + 1
+        if count == 0:
+            for key in self._piece_keys(car_number):
+                self._pieces.setdefault(key, set()).add(car_number)
+
+    def discard(self, car_number: str) -> None:
+        """
+        Исключение проезда с номером; номер удаляется из индекса вместе с последним проездом
+
+        Args:
+            car_number (str): Номер автомобиля
+        """
+        count = self._counts.get(car_number, 0)
+        if count > 1:
+            self._counts[car_number] = count - 1
+        elif count == 1:
+            del self._counts[car_number]
+            for key in self._piece_keys(car_number):
+                plates = self._pieces[key]
+                plates.discard(car_number)
+                if not plates:
+                    del self._pieces[key]
+
+    def search(self, query: str, k: int = 1, limit: int | None = None) -> list[tuple[str, int]]:
+        """
+        Поиск номеров на расстоянии Левенштейна не более k
+
+        Args:
+            query (str): Искомый номер
+            k (int): Допустимое число ошибок (не больше max_distance)
+            limit (int | None): Максимальное количество результатов
+
+        Returns:
+            list[tuple[str, int]]: Номера и расстояния, по возрастанию расстояния
+        """
+        if k > self.max_distance:
+            raise ValueError(f"Расстояние {k} больше допустимого для индекса ({self.max_distance})")
+        candidates = set()
+        for length in range(max(1, len(query) - k), len(query) + k + 1):
+            for piece_number, (start, end) in enumerate(self._piece_bounds(length)):
+                for shift in range(-k, k + 1):
+                    if start + shift < 0 or end + shift > len(query):
+                        continue
+                    plates = self._pieces.get((length, piece_number, query[start + shift:end + shift]))
+                    if plates:
+                        candidates |= plates
+        results = []
+        for car_number in candidates:
+            distance = levenshtein(query, car_number, k)
+            if distance <= k:
+                results.append((car_number, distance))
+        results.sort(key=lambda result: (result[1], result[0]))
+        return results[:limit] if limit is not None else results
+
+    def _piece_bounds(self, length: int) -> list[tuple[int, int]]:
+        """Границы частей номера заданной длины"""
+        pieces = self.max_distance + 1
+        return [(length * i // pieces, length * (i + 1) // pieces) for i in range(pieces)]
+
+    def _piece_keys(self, car_number: str) -> list[tuple[int, int, str]]:
+        """Ключи индекса для номера: длина, номер части и сама часть"""
+        length = len(car_number)
+        return [(length, piece_number, car_number[start:end])
+                for piece_number, (start, end) in enumerate(self._piece_bounds(length))]
+
+def levenshtein(first: str, second: str, limit: int) -> int:
+    """
+    Расстояние Левенштейна с ранним выходом
+
+    Args:
+        first (str): Первая строка
+        second (str): Вторая строка
+        limit (int): Порог; если расстояние больше, возвращается limit + 1
+
+    Returns:
+        int: Расстояние или limit + 1
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (first_char != second_char)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
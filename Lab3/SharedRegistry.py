@@ -0,0 +1,204 @@
+import argparse
+import datetime
+import os
+import struct
+import sys
+from array import array
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from CarPass import CarPass
+
+class SharedRegistry:
+    """
+    Реестр проездов в разделяемой памяти для нескольких процессов
+
+    Процесс-владелец один раз раскладывает записи по столбцам в сегменте
+    multiprocessing.shared_memory: расход топлива (double), порядковый номер
+    даты (int32), индекс номера (uint32), смещения номеров в таблице строк
+    (uint32) и сама таблица строк в UTF-8. Другие процессы подключаются к
+    сегменту по имени без копирования и разбора: столбцы читаются через
+    memoryview только для чтения, а объекты CarPass создаются только при обращении к записи.
+    Время проезда не хранится, только дата (как и в файле реестра).
+
+    Владелец удаляет сегмент методом unlink (или при выходе из блока with);
+    читатели только закрывают своё отображение методом close.
+    """
+
+    magic = b"CARPASS1"
+    header = struct.Struct("<8sQQQ")
+
+    def __init__(self, shm: SharedMemory, owner: bool):
+        """
+        Привязка к сегменту (используйте publish или attach)
+
+        Args:
+            shm (SharedMemory): Сегмент разделяемой памяти
+            owner (bool): Создан ли сегмент этим процессом
+        """
+        self._shm = shm
+        self.owner = owner
+        magic, count, plate_count, strings_size = self.header.unpack_from(shm.buf)
+        if magic != self.magic:
+            raise ValueError(f"Сегмент {shm.name} не содержит реестра проездов")
+        self._count = count
+        self.plate_count = plate_count
+        layout = self._layout(count, plate_count, strings_size)
+        buffer = shm.buf
+        # Столбцы открываются только для чтения: запись в сегмент видна всем процессам.
+        # Срез берётся по точной длине столбца, без выравнивания до 8 байт
+        self.fuel = buffer[layout[0]:layout[0] + 8 * count].cast('d').toreadonly()
+        self.ordinals = buffer[layout[1]:layout[1] + 4 * count].cast('i').toreadonly()
+        self.plate_ids = buffer[layout[2]:layout[2] + 4 * count].cast('I').toreadonly()
+        self._plate_offsets = buffer[layout[3]:layout[3] + 4 * (plate_count + 1)].cast('I').toreadonly()
+        self._strings = buffer[layout[4]:layout[5]].toreadonly()
+
+    @property
+    def name(self) -> str:
+        """Имя сегмента для подключения из других процессов"""
+        return self._shm.name
+
+    @staticmethod
+    def _tracker_name(shm: SharedMemory) -> str:
+        """Имя сегмента, под которым его учитывает resource_tracker (на POSIX - с ведущим "/")"""
+        return "/" + shm.name if os.name == "posix" else shm.name
+
+    @classmethod
+    def _layout(cls, count: int, plate_count: int, strings_size: int) -> list[int]:
+        """Границы столбцов в сегменте; числовые столбцы выровнены по 8 байт"""
+        bounds = [cls.header.size]
+        for size in (8 * count, 4 * count, 4 * count, 4 * (plate_count + 1)):
+            bounds.append(bounds[-1] + (size + 7) // 8 * 8)
+        bounds.append(bounds[-1] + strings_size)
+        return bounds
+
+    @classmethod
+    def publish(cls, products, name: str | None = None) -> 'SharedRegistry':
+        """
+        Размещение записей в новом сегменте разделяемой памяти
+
+        Args:
+            products: Записи о проездах (список, снимок реестра или ленивый список;
+                невалидные строки ленивого списка пропускаются)
+            name (str | None): Имя сегмента (по умолчанию выбирается автоматически)
+
+        Returns:
+            SharedRegistry: Реестр, владеющий сегментом
+        """
+        fuel = array('d')
+        ordinals = array('i')
+        plate_ids = array('I')
+        plate_table = {}
+        for product in products:
+            if product is None:
+                continue
+            plate_id = plate_table.get(product.car_number)
+            if plate_id is None:
+                plate_id = plate_table[product.car_number] = len(plate_table)
+            fuel.append(product.fuel_consumption)
+            ordinals.append(product.pass_date.toordinal())
+            plate_ids.append(plate_id)
+        plate_offsets = array('I', [0])
+        strings = bytearray()
+        for car_number in plate_table:
+            strings += car_number.encode('utf-8')
+            plate_offsets.append(len(strings))
+
+        layout = cls._layout(len(fuel), len(plate_table), len(strings))
+        shm = SharedMemory(name, create=True, size=max(layout[-1], 1))
+        try:
+            cls.header.pack_into(shm.buf, 0, cls.magic, len(fuel), len(plate_table), len(strings))
+            for start, column in zip(layout, (fuel, ordinals, plate_ids, plate_offsets, strings)):
+                data = memoryview(column).cast('B')
+                shm.buf[start:start + len(data)] = data
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedRegistry':
+        """
+        Подключение к опубликованному реестру без копирования
+
+        Args:
+            name (str): Имя сегмента (SharedRegistry.name у владельца)
+
+        Returns:
+            SharedRegistry: Реестр только для чтения
+        """
+        if sys.version_info >= (3, 13):
+            shm = SharedMemory(name, track=False)
+        else:
+            shm = SharedMemory(name)
+            # До Python 3.13 подключение тоже регистрирует сегмент, и при выходе читателя
+            # он был бы удалён; сегментом распоряжается только владелец
+            resource_tracker.unregister(cls._tracker_name(shm), "shared_memory")
+        return cls(shm, owner=False)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> CarPass:
+        """
+        Создание записи о проезде по индексу
+
+        Args:
+            index (int): Индекс записи
+
+        Returns:
+            CarPass: Запись о проезде
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Индекс записи вне диапазона")
+        return CarPass(datetime.datetime.fromordinal(self.ordinals[index]),
+                       self.plate(self.plate_ids[index]), self.fuel[index])
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def plate(self, plate_id: int) -> str:
+        """
+        Получение номера автомобиля по его индексу в таблице строк
+
+        Args:
+            plate_id (int): Индекс номера (значение столбца plate_ids)
+
+        Returns:
+            str: Номер автомобиля
+        """
+        return str(self._strings[self._plate_offsets[plate_id]:self._plate_offsets[plate_id + 1]], 'utf-8')
+
+    def close(self) -> None:
+        """Закрытие отображения сегмента в этом процессе"""
+        for view in (self.fuel, self.ordinals, self.plate_ids, self._plate_offsets, self._strings):
+            view.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Удаление сегмента (только для владельца, после завершения работы читателей)"""
+        if sys.version_info < (3, 13):
+            # Читатели, запущенные из этого процесса, делят с ним resource_tracker и снимают
+            # регистрацию сегмента; повторная регистрация делает снятие в unlink корректным
+            resource_tracker.register(self._tracker_name(self._shm), "shared_memory")
+        self._shm.unlink()
+
+    def __enter__(self) -> 'SharedRegistry':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Публикация реестра в разделяемой памяти")
+    argument_parser.add_argument("filename", help="файл реестра")
+    argument_parser.add_argument("--name", help="имя сегмента")
+    arguments = argument_parser.parse_args()
+    from main import Logger, ProductFileHandler
+    with SharedRegistry.publish(ProductFileHandler(Logger()).load_products(arguments.filename), arguments.name) as registry:
+        input(f"Реестр из {len(registry)} записей опубликован в сегменте {registry.name}. Enter - завершить")
@@ -0,0 +1,119 @@
+import os
+from CarPass import CarPass
+from CarPassParser import CarPassParser
+from LoadReport import LoadReport
+
+class SupplyFileFollower:
+    """
+    Класс для чтения только новых строк, дописываемых в файл реестра
+
+    Запоминает смещение и inode файла; при каждом опросе читает лишь
+    полностью записанные новые строки. Обрезка файла приводит к чтению с
+    начала, а ротация (подмена файла по тому же пути) - к дочитыванию
+    старого файла и переходу на новый.
+    """
+
+    def __init__(self, filename: str, parser: CarPassParser, logger, from_start: bool = True):
+        """
+        Инициализация отслеживания файла
+
+        Args:
+            filename (str): Путь к файлу реестра
+            parser (CarPassParser): Разборщик строк
+            logger (Logger): Логгер для сводки ошибок разбора (одна запись на опрос)
+            from_start (bool): Прочитать уже имеющиеся строки при первом опросе
+        """
+        self.filename = filename
+        self.parser = parser
+        self.logger = logger
+        self._file = None
+        self._inode = None
+        self._pending = b''
+        self.offset = 0
+        self.line_number = 0
+        self._report = None
+        self._open(seek_end=not from_start)
+
+    def poll(self) -> list[CarPass]:
+        """
+        Чтение новых полностью записанных строк
+
+        Returns:
+            list[CarPass]: Новые валидные записи о проездах
+        """
+        self._report = LoadReport()
+        try:
+            return self._poll()
+        finally:
+            if self._report.rejected:
+                self.logger.log_message("ОШИБКА", f"При чтении файла {self.filename} отклонены строки. {self._report.summary()}")
+
+    def _poll(self) -> list[CarPass]:
+        """Чтение новых строк с учётом обрезки и замены файла"""
+        if self._file is None:
+            self._open(seek_end=False)
+            if self._file is None:
+                return []
+
+        products = self._read_new()
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return products
+
+        if stat.st_ino != self._inode:
+            # Файл заменён: старый уже дочитан, переходим на новый с начала
+            self.logger.log_message("ПРЕДУПРЕЖДЕНИЕ", f"Файл {self.filename} заменён, чтение нового файла с начала")
+            self._file.close()
+            self._open(seek_end=False)
+            products += self._read_new()
+        elif stat.st_size < self.offset:
+            self.logger.log_message("ПРЕДУПРЕЖДЕНИЕ", f"Файл {self.filename} обрезан, чтение с начала")
+            self._file.seek(0)
+            self._pending = b''
+            self.offset = 0
+            self.line_number = 0
+            products += self._read_new()
+        return products
+
+    def close(self) -> None:
+        """Прекращение отслеживания файла"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self, seek_end: bool) -> None:
+        """
+        Открытие файла и запоминание его inode
+
+        Args:
+            seek_end (bool): Начать с конца файла, пропустив имеющиеся строки
+        """
+        try:
+            self._file = open(self.filename, 'rb')
+        except FileNotFoundError:
+            self._file = None
+            return
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._pending = b''
+        self.offset = self._file.seek(0, os.SEEK_END) if seek_end else 0
+        # При чтении с конца номера строк считаются от места начала отслеживания
+        self.line_number = 0
+
+    def _read_new(self) -> list[CarPass]:
+        """Чтение дописанных данных; неполная последняя строка откладывается до следующего опроса"""
+        data = self._pending + self._file.read()
+        end = data.rfind(b'\n') + 1
+        self._pending = data[end:]
+        products = []
+        for line in data[:end].splitlines(keepends=True):
+            self.line_number += 1
+            text = line.decode('utf-8', errors='replace').strip()
+            if text:
+                try:
+                    products.append(self.parser.parse_line(text))
+                except Exception as e:
+                    self._report.record_rejected(self.line_number, text, e)
+            self.offset += len(line)
+        self._report.record_accepted(len(products))
+        return products
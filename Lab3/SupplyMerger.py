@@ -0,0 +1,165 @@
+import argparse
+import heapq
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from CarPassBase import CarPassBase
+from CarPassParser import CarPassParser
+from file_utils import open_text_file
+from LoadReport import LoadReport
+
+class SupplyMerger:
+    """
+    Слияние нескольких упорядоченных по дате файлов реестра в один поток
+
+    Каждый файл читается пакетами по batch_size строк в пуле потоков.
+    Первые пакеты всех файлов запрашиваются сразу, до начала слияния;
+    следующий пакет файла запрашивается, как только слияние забрало
+    предыдущий, поэтому чтение идёт параллельно со слиянием, а задачи пула
+    никогда не ждут друг друга. Пакеты сливаются кучей (heapq.merge), так
+    что в памяти одновременно находится не более двух пакетов на файл,
+    независимо от общего числа записей. При равных датах записи идут в
+    порядке перечисления файлов.
+    """
+
+    def __init__(self, filenames: list[str], workers: int = 8, batch_size: int = 1024,
+                 report: LoadReport | None = None):
+        """
+        Инициализация слияния
+
+        Args:
+            filenames (list[str]): Файлы реестра, каждый упорядочен по дате (могут быть сжатыми)
+            workers (int): Количество потоков чтения
+            batch_size (int): Количество строк в одном пакете чтения
+            report (LoadReport | None): Сводка для отклонённых строк, в том числе
+                нарушающих порядок дат
+        """
+        self.filenames = list(filenames)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.report = report if report is not None else LoadReport()
+        self._report_lock = threading.Lock()
+
+    def __iter__(self):
+        """Записи всех файлов в порядке возрастания даты"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            states = []
+            try:
+                for filename in self.filenames:
+                    states.append({"filename": filename, "file": open_text_file(filename, 'r'),
+                                   "line_number": 0, "last_date": None, "parser": CarPassParser(),
+                                   "future": None})
+                # heapq.merge берёт первые записи файлов по очереди, поэтому первые пакеты
+                # запрашиваются заранее и читаются параллельно
+                for state in states:
+                    state["future"] = pool.submit(self._read_batch, state)
+                sources = [self._records(pool, state) for state in states]
+                yield from heapq.merge(*sources, key=lambda product: product.pass_date)
+            finally:
+                # Прерванное слияние закрывает файлы и дожидается начатых чтений
+                for state in states:
+                    future = state["future"]
+                    if future is not None and not future.cancel():
+                        future.exception()
+                    if state["file"] is not None:
+                        state["file"].close()
+
+    def merge_into(self, product_manager) -> int:
+        """
+        Добавление записей всех файлов в менеджер в порядке дат
+
+        Args:
+            product_manager (ProductManager): Менеджер записей
+
+        Returns:
+            int: Количество добавленных записей
+        """
+        count = 0
+        for product in self:
+            product_manager.add_product(product)
+            count += 1
+        return count
+
+    def _records(self, pool: ThreadPoolExecutor, state: dict):
+        """Записи одного файла; следующий пакет читается в пуле, пока отдаётся текущий"""
+        while True:
+            batch = state["future"].result()
+            if not batch and state["file"] is None:
+                state["future"] = None
+                break
+            state["future"] = pool.submit(self._read_batch, state)
+            yield from batch
+
+    def _read_batch(self, state: dict) -> list[CarPassBase]:
+        """Чтение и разбор очередного пакета строк файла; в конце файла он закрывается"""
+        filename = state["filename"]
+        batch = []
+        file = state["file"]
+        if file is None:
+            return batch
+        parser = state["parser"]
+        last_date = state["last_date"]
+        line_number = state["line_number"]
+        rejected = []
+        for line in file:
+            line_number += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                product = parser.parse_line(line)
+            except Exception as e:
+                rejected.append((line_number, line, e))
+                continue
+            if last_date is not None and product.pass_date < last_date:
+                rejected.append((line_number, line, f"Нарушен порядок дат: {product.pass_date:%Y-%m-%d} после {last_date:%Y-%m-%d}"))
+                continue
+            last_date = product.pass_date
+            batch.append(product)
+            if len(batch) >= self.batch_size:
+                break
+        else:
+            file.close()
+            state["file"] = None
+        state["last_date"] = last_date
+        state["line_number"] = line_number
+        with self._report_lock:
+            self.report.record_accepted(len(batch))
+            for rejected_line_number, line, error in rejected:
+                self.report.record_rejected(rejected_line_number, f"{filename}: {line}", error)
+        return batch
+
+def merge_files(filenames: list[str], output: str, workers: int = 8, batch_size: int = 1024) -> LoadReport:
+    """
+    Слияние файлов реестра в один упорядоченный по дате файл
+
+    Args:
+        filenames (list[str]): Входные файлы, каждый упорядочен по дате
+        output (str): Выходной файл (сжимается по расширению .gz, .bz2, .xz)
+        workers (int): Количество потоков чтения
+        batch_size (int): Количество строк в одном пакете чтения
+
+    Returns:
+        LoadReport: Сводка по принятым и отклонённым строкам
+
+    Raises:
+        ValueError: Если выходной файл совпадает с одним из входных
+    """
+    for filename in filenames:
+        if os.path.realpath(filename) == os.path.realpath(output) or (
+                os.path.exists(output) and os.path.exists(filename) and os.path.samefile(filename, output)):
+            raise ValueError(f"Выходной файл {output} совпадает с входным файлом {filename}")
+    from main import Logger, ProductFileHandler
+    merger = SupplyMerger(filenames, workers, batch_size)
+    ProductFileHandler(Logger()).save_products(merger, output)
+    return merger.report
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Слияние упорядоченных по дате файлов реестра")
+    argument_parser.add_argument("files", nargs="+", help="входные файлы пунктов пропуска")
+    argument_parser.add_argument("-o", "--output", required=True, help="выходной файл реестра")
+    argument_parser.add_argument("--workers", type=int, default=8)
+    argument_parser.add_argument("--batch-size", type=int, default=1024)
+    arguments = argument_parser.parse_args()
+    report = merge_files(arguments.files, arguments.output, arguments.workers, arguments.batch_size)
+    print(report.summary())
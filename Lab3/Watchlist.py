@@ -0,0 +1,109 @@
+from operator import itemgetter
+from CarPassBase import CarPassBase
+from CarPassParser import CarPassParser
+
+class Watchlist:
+    """
+    Класс для проверки номеров по списку разыскиваемых автомобилей
+
+    Точные номера хранятся в множестве. Шаблоны с символом "*" (любой один
+    символ, например "А***КВ78") группируются по длине и набору известных
+    позиций; для каждой группы ведётся словарь "символы на известных
+    позициях -> шаблоны". Проверка номера - по одному поиску в словаре на
+    группу его длины, независимо от числа шаблонов в группе.
+    """
+
+    wildcard = "*"
+
+    def __init__(self, logger=None, on_match=None):
+        """
+        Инициализация пустого списка
+
+        Args:
+            logger (Logger): Логгер для записи совпадений, если on_match не задан
+            on_match: Функция on_match(product, patterns), вызываемая при совпадении
+        """
+        self.logger = logger
+        self.on_match = on_match
+        self.exact = set()
+        # длина -> {известные позиции -> (функция выборки символов, {символы -> шаблоны})}
+        self._groups = {}
+        self._pattern_count = 0
+        self._parser = CarPassParser()
+
+    def __len__(self) -> int:
+        return len(self.exact) + self._pattern_count
+
+    def add(self, entry: str) -> None:
+        """
+        Добавление номера или шаблона
+
+        Args:
+            entry (str): Номер автомобиля или шаблон с символами "*"
+        """
+        entry = self._parser.normalize_car_number(entry)
+        if self.wildcard not in entry:
+            self.exact.add(entry)
+            return
+        positions = tuple(i for i, char in enumerate(entry) if char != self.wildcard)
+        groups = self._groups.setdefault(len(entry), {})
+        if positions not in groups:
+            # Выборка символов по позициям; для шаблона из одних "*" ключ пустой
+            getter = itemgetter(*positions) if positions else (lambda car_number: ())
+            groups[positions] = (getter, {})
+        getter, table = groups[positions]
+        patterns = table.setdefault(getter(entry), [])
+        if entry not in patterns:
+            patterns.append(entry)
+            self._pattern_count += 1
+
+    def load(self, filename: str) -> None:
+        """
+        Загрузка списка из файла (одна запись на строку)
+
+        Args:
+            filename (str): Путь к файлу списка
+        """
+        with open(filename, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if line:
+                    self.add(line)
+
+    def match(self, car_number: str) -> list[str]:
+        """
+        Поиск записей списка, которым соответствует номер
+
+        Args:
+            car_number (str): Номер автомобиля
+
+        Returns:
+            list[str]: Совпавшие номер и шаблоны
+        """
+        matches = [car_number] if car_number in self.exact else []
+        groups = self._groups.get(len(car_number))
+        if groups:
+            for getter, table in groups.values():
+                patterns = table.get(getter(car_number))
+                if patterns is not None:
+                    matches.extend(patterns)
+        return matches
+
+    def check(self, product: CarPassBase) -> bool:
+        """
+        Проверка записи о проезде с уведомлением о совпадении
+
+        Args:
+            product (CarPassBase): Запись о проезде
+
+        Returns:
+            bool: True, если номер есть в списке
+        """
+        matches = self.match(product.car_number)
+        if not matches:
+            return False
+        if self.on_match is not None:
+            self.on_match(product, matches)
+        elif self.logger is not None:
+            self.logger.log_message("РОЗЫСК", f"Проезд автомобиля из списка розыска: {product} (совпадения: {', '.join(matches)})")
+        return True
@@ -0,0 +1,47 @@
+"""
+Замер скорости дозаписи в общий файл реестра несколькими процессами
+
+Запуск: python bench_append_writer.py [процессов] [записей_на_процесс] [размер_группы]
+"""
+import datetime
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from AppendWriter import AppendWriter
+from CarPass import CarPass
+
+def write_records(filename: str, writer_id: int, count: int, group_size: int, results) -> None:
+    """Запись count записей одним процессом с замером времени"""
+    product = CarPass(datetime.datetime(2023, 1, 2), f"А123ВК{10 + writer_id}", 7.5)
+    started = time.perf_counter()
+    with AppendWriter(filename, group_size=group_size) as writer:
+        for _ in range(count):
+            writer.write(product)
+    results.put((writer_id, count / (time.perf_counter() - started)))
+
+def main() -> None:
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    group_size = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "supply.txt")
+        processes = [context.Process(target=write_records, args=(filename, writer_id, count, group_size, results))
+                     for writer_id in range(writers)]
+        for process in processes:
+            process.start()
+        rates = sorted(results.get() for _ in processes)
+        for process in processes:
+            process.join()
+        with open(filename, 'rb') as file:
+            lines = file.read().count(b"\n")
+    print(f"Процессов: {writers}, записей на процесс: {count}, размер группы: {group_size}")
+    for writer_id, rate in rates:
+        print(f"Процесс {writer_id}: {rate:.0f} записей/с")
+    print(f"Строк в файле: {lines} (ожидалось {writers * count})")
+
+if __name__ == "__main__":
+    main()
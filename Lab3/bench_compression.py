@@ -0,0 +1,64 @@
+"""
+Сравнение скорости загрузки и размера файлов реестра для несжатого текста
+и форматов gzip, bzip2 и xz
+
+Запуск: python bench_compression.py [количество_записей]
+"""
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+from CarPass import CarPass
+from main import ProductFileHandler
+
+LETTERS = "АВЕКМНОРСТУХ"
+
+class SilentLogger:
+    """Логгер-заглушка, чтобы запись лога не влияла на замеры"""
+
+    def log_message(self, level: str, message: str) -> None:
+        pass
+
+def generate_products(count: int) -> list[CarPass]:
+    """
+    Генерация случайных записей о проездах
+
+    Args:
+        count (int): Количество записей
+
+    Returns:
+        list[CarPass]: Список записей
+    """
+    rng = random.Random(42)
+    start = datetime.datetime(2020, 1, 1)
+    products = []
+    for _ in range(count):
+        car_number = (rng.choice(LETTERS) + f"{rng.randint(0, 999):03d}"
+                      + rng.choice(LETTERS) + rng.choice(LETTERS) + f"{rng.randint(1, 199):02d}")
+        products.append(CarPass(start + datetime.timedelta(days=rng.randint(0, 1500)),
+                                car_number, round(rng.uniform(3.0, 20.0), 1)))
+    return products
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    products = generate_products(count)
+    file_handler = ProductFileHandler(SilentLogger())
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Записей: {count}")
+        print(f"{'Формат':<8}{'Байт на диске':>16}{'Запись, с':>12}{'Чтение, с':>12}{'Записей/с':>14}")
+        for extension in (".txt", ".gz", ".bz2", ".xz"):
+            filename = os.path.join(directory, "supply" + extension)
+            started = time.perf_counter()
+            file_handler.save_products(products, filename)
+            save_time = time.perf_counter() - started
+            started = time.perf_counter()
+            loaded = file_handler.load_products(filename)
+            load_time = time.perf_counter() - started
+            assert len(loaded) == count
+            print(f"{extension:<8}{os.path.getsize(filename):>16}{save_time:>12.2f}"
+                  f"{load_time:>12.2f}{count / load_time:>14.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Замер скорости потокового поиска аномального расхода топлива
+
+Запуск: python bench_fuel_anomaly.py [записей] [автомобилей] [размер_окна] [размер_пакета]
+"""
+import random
+import sys
+import time
+from FuelAnomalyDetector import FuelAnomalyDetector
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cars = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    window = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    batch_size = int(sys.argv[4]) if len(sys.argv) > 4 else 65536
+    rng = random.Random(42)
+    plates = [f"А{i % 1000:03d}ВК{i // 1000 + 10}" for i in range(cars)]
+    car_numbers = [rng.choice(plates) for _ in range(records)]
+    fuel_values = [rng.gauss(8.0, 0.5) if rng.random() > 0.001 else 30.0 for _ in range(records)]
+    print(f"Записей: {records}, автомобилей: {cars}, окно: {window}")
+
+    detector = FuelAnomalyDetector(window=window)
+    update = detector.update
+    started = time.perf_counter()
+    anomalies = sum(update(car_number, fuel_consumption) is not None
+                    for car_number, fuel_consumption in zip(car_numbers, fuel_values))
+    elapsed = time.perf_counter() - started
+    print(f"update:      аномалий {anomalies}, {elapsed:.2f} с, {records / elapsed:.0f} записей/с")
+
+    detector = FuelAnomalyDetector(window=window)
+    started = time.perf_counter()
+    anomalies = 0
+    for start in range(0, records, batch_size):
+        anomalies += len(detector.update_many(car_numbers[start:start + batch_size], fuel_values[start:start + batch_size]))
+    elapsed = time.perf_counter() - started
+    print(f"update_many: аномалий {anomalies}, {elapsed:.2f} с, {records / elapsed:.0f} записей/с (пакеты по {batch_size})")
+
+if __name__ == "__main__":
+    main()
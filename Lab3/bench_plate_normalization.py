@@ -0,0 +1,73 @@
+"""
+Оценка нормализации и интернирования номеров при загрузке реестра:
+доля строк, прошедших проверку, и экономия памяти на строках номеров
+
+Запуск: python bench_plate_normalization.py [количество_проездов] [количество_автомобилей]
+"""
+import random
+import sys
+from CarPassParser import CarPassParser
+
+LETTERS = "АВЕКМНОРСТУХ"
+LOOKALIKES = str.maketrans("АВЕКМНОРСТУХ", "ABEKMHOPCTYX")
+
+def generate_lines(passes: int, cars: int) -> list[str]:
+    """
+    Генерация строк реестра; примерно треть номеров записана латиницей или строчными буквами
+
+    Args:
+        passes (int): Количество проездов
+        cars (int): Количество различных автомобилей
+
+    Returns:
+        list[str]: Строки файла реестра
+    """
+    rng = random.Random(42)
+    plates = [rng.choice(LETTERS) + f"{rng.randint(0, 999):03d}" + rng.choice(LETTERS)
+              + rng.choice(LETTERS) + f"{rng.randint(1, 199):02d}" for _ in range(cars)]
+    lines = []
+    for _ in range(passes):
+        plate = rng.choice(plates)
+        variant = rng.random()
+        if variant < 0.2:
+            plate = plate.translate(LOOKALIKES)
+        elif variant < 0.3:
+            plate = plate.lower()
+        lines.append(f"2023-01-{rng.randint(1, 28):02d},{plate},{rng.uniform(3.0, 20.0):.1f}")
+    return lines
+
+def measure(lines: list[str], normalize: bool) -> tuple[int, int]:
+    """
+    Разбор строк с нормализацией или без неё
+
+    Returns:
+        tuple[int, int]: Количество принятых строк и байт памяти, занятых строками номеров
+    """
+    parser = CarPassParser()
+    if not normalize:
+        parser.normalize_car_number = lambda car_number: car_number
+        parser.intern_car_number = lambda car_number: car_number
+    products = []
+    for line in lines:
+        try:
+            products.append(parser.parse_line(line))
+        except ValueError:
+            pass
+    # Каждый различный объект строки номера учитывается один раз
+    distinct = {id(product.car_number): sys.getsizeof(product.car_number) for product in products}
+    return len(products), sum(distinct.values())
+
+def main() -> None:
+    passes = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    cars = int(sys.argv[2]) if len(sys.argv) > 2 else 3_000
+    lines = generate_lines(passes, cars)
+    raw_accepted, raw_bytes = measure(lines, normalize=False)
+    accepted, interned_bytes = measure(lines, normalize=True)
+    print(f"Проездов: {passes}, автомобилей: {cars}")
+    print(f"Принято без нормализации: {raw_accepted} ({raw_accepted / passes:.1%})")
+    print(f"Принято с нормализацией:  {accepted} ({accepted / passes:.1%})")
+    print(f"Память строк номеров без интернирования: {raw_bytes / 1024:.0f} КиБ")
+    print(f"Память строк номеров с интернированием:  {interned_bytes / 1024:.0f} КиБ")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Замер получения снимка реестра и стоимости первой записи после снимка
+
+Запуск: python bench_snapshot.py [записей]
+"""
+import datetime
+import sys
+import time
+from CarPass import CarPass
+from main import ProductManager
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    date = datetime.datetime(2023, 1, 2)
+    manager = ProductManager()
+    manager.replace_products([CarPass(date, "А123ВК78", 7.5) for _ in range(count)])
+
+    started = time.perf_counter()
+    manager.get_products()
+    copy_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        manager.snapshot()
+        manager.add_product(CarPass(date, "В456КМ12", 8.2))
+    cycle_time = (time.perf_counter() - started) / 1000
+
+    print(f"Записей: {count}")
+    print(f"Полная копия (get_products): {copy_time * 1000:.2f} мс")
+    print(f"Снимок и добавление записи: {cycle_time * 1000:.3f} мс")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Замер скорости проверки проездов по списку розыска
+
+Запуск: python bench_watchlist.py [проездов] [записей_в_списке] [доля_шаблонов]
+"""
+import datetime
+import random
+import sys
+import time
+from CarPass import CarPass
+from Watchlist import Watchlist
+
+LETTERS = "АВЕКМНОРСТУХ"
+
+def random_plate(rng: random.Random) -> str:
+    return (rng.choice(LETTERS) + f"{rng.randint(0, 999):03d}" + rng.choice(LETTERS)
+            + rng.choice(LETTERS) + f"{rng.randint(1, 199):02d}")
+
+def main() -> None:
+    passes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    entries = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+    wildcard_share = float(sys.argv[3]) if len(sys.argv) > 3 else 0.1
+    rng = random.Random(42)
+
+    started = time.perf_counter()
+    watchlist = Watchlist(on_match=lambda product, matches: None)
+    for _ in range(entries):
+        plate = random_plate(rng)
+        if rng.random() < wildcard_share:
+            # Частичный номер: неизвестны две-три позиции из цифр и букв серии
+            positions = rng.sample(range(1, 6), rng.randint(2, 3))
+            plate = "".join("*" if i in positions else char for i, char in enumerate(plate))
+        watchlist.add(plate)
+    build_time = time.perf_counter() - started
+
+    date = datetime.datetime(2023, 1, 2)
+    products = [CarPass(date, random_plate(rng), 7.5) for _ in range(passes)]
+    started = time.perf_counter()
+    matched = sum(watchlist.check(product) for product in products)
+    check_time = time.perf_counter() - started
+
+    print(f"Записей в списке: {len(watchlist)} (шаблонов ~{wildcard_share:.0%}), построение: {build_time:.2f} с")
+    print(f"Проездов: {passes}, совпадений: {matched}")
+    print(f"Проверка: {check_time:.2f} с, {passes / check_time:.0f} проездов/с")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Единственная точка подключения общего пакета common (в корне репозитория) для модулей Lab3
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+from common.compression import COMPRESSION_EXTENSIONS, COMPRESSION_MAGIC, detect_compression, open_text_file
+from common.load_report import ErrorBudgetExceeded, LoadReport
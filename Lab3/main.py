@@ -1,13 +1,30 @@
 import sys
-import re
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QTableView, QPushButton, QLineEdit, QDateEdit, QDoubleSpinBox,
                              QLabel, QMessageBox, QFileDialog)
-from PyQt6.QtCore import QDate, Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtCore import QDate, Qt, QAbstractTableModel, QModelIndex, QTimer
 from CarPass import CarPass
 from CarPassBase import CarPassBase
+from AppendWriter import AppendWriter
+from CarPassParser import CarPassParser
+from CarPassVector import CarPassVector
+from LazyCarPassList import LazyCarPassList
+from LoadReport import LoadReport
+from PartitionedStorage import PartitionedStorage
+from ParsedResultCache import ParsedResultCache
+from PassRollups import PassRollups
+from PlateIndex import PlateIndex
+from Watchlist import Watchlist
+from SupplyFileFollower import SupplyFileFollower
+from FuelAnomalyDetector import FuelAnomalyDetector
+from file_utils import detect_compression, open_text_file
+import contextlib
 import datetime
 import os.path
+import threading
+
+WATCHLIST_FILENAME = "watchlist.txt"
+SEARCH_RESULTS_LIMIT = 20
 
 class Logger:
     """Класс для управления логированием ошибок"""
@@ -34,11 +51,33 @@ class Logger:
                 file.write(f"{datetime.datetime.now().strftime('%d-%m-%Y %H:%M:%S')} {level} {message}\n")
 
 class ProductManager:
-    """Класс для управления коллекцией записей о проездах"""
+    """
+    Класс для управления коллекцией записей о проездах
+    
+    Записи хранятся в списке с копированием при записи, поэтому снимок
+    реестра для сохранения или отчёта в другом потоке получается за O(1)
+    и не меняется при последующем редактировании.
+    """
     
     def __init__(self):
         """Инициализация пустого списка записей"""
-        self.car_passes = []
+        self.car_passes = CarPassVector()
+        self.rollups = PassRollups()
+        self.plate_index = PlateIndex(max_distance=1)
+        self.record_hooks = []
+        self.version = 0
+        self._snapshot = None
+        # Фоновое построение индекса номеров: поток, результат и изменения за время построения
+        self._plate_index_build = None
+    
+    def add_record_hook(self, hook) -> None:
+        """
+        Добавление обработчика, вызываемого для каждой добавленной записи
+        
+        Args:
+            hook: Функция hook(product), например Watchlist.check
+        """
+        self.record_hooks.append(hook)
     
     def add_product(self, product: CarPassBase) -> None:
         """
@@ -48,6 +87,15 @@ class ProductManager:
             product (CarPassBase): Запись о проезде
         """
         self.car_passes.append(product)
+        self._changed()
+        if self.rollups is not None:
+            self.rollups.add(product)
+        if self.plate_index is not None:
+            self.plate_index.add(product.car_number)
+        elif self._plate_index_build is not None:
+            self._plate_index_build["changes"].append((True, product.car_number))
+        for hook in self.record_hooks:
+            hook(product)
     
     def delete_product(self, index: int) -> None:
         """
@@ -57,15 +105,164 @@ class ProductManager:
             index (int): Индекс записи
         """
         if 0 <= index < len(self.car_passes):
+            product = self.car_passes[index]
             del self.car_passes[index]
+            self._changed()
+            if self.rollups is not None and product is not None:
+                self.rollups.remove(product)
+            if product is not None:
+                if self.plate_index is not None:
+                    self.plate_index.discard(product.car_number)
+                elif self._plate_index_build is not None:
+                    self._plate_index_build["changes"].append((False, product.car_number))
     
     def clear_products(self) -> None:
         """Удаление всех записей о проездах"""
-        self.car_passes = []
+        self._close_products()
+        self.car_passes = CarPassVector()
+        self._changed()
+        self.rollups = PassRollups()
+        self.plate_index = PlateIndex(max_distance=1)
+        self._plate_index_build = None
+    
+    def replace_products(self, products: list[CarPassBase] | LazyCarPassList, rollups: PassRollups | None = None) -> None:
+        """
+        Замена всех записей новым списком (в том числе ленивым)
+        
+        Args:
+            products (list[CarPassBase] | LazyCarPassList): Новый список записей
+            rollups (PassRollups | None): Готовые агрегаты по этим записям; для обычного
+                списка без агрегатов они строятся заново, для ленивого остаются неизвестными
+        """
+        if rollups is None and isinstance(products, list):
+            rollups = PassRollups.from_products(products)
+        if products is not self.car_passes:
+            self._close_products()
+        self.car_passes = CarPassVector(products) if isinstance(products, list) else products
+        self._changed()
+        self.rollups = rollups
+        # Индекс номеров строится в фоне при первом поиске
+        self.plate_index = None
+        self._plate_index_build = None
+    
+    def search_plates(self, query: str, max_errors: int = 1, limit: int | None = None,
+                      wait: bool = True) -> list[tuple[str, int]] | None:
+        """
+        Нечёткий поиск номеров, встречающихся в реестре
+        
+        Индекс номеров после загрузки строится в фоновом потоке по снимку
+        реестра; записи, добавленные и удалённые за это время, учитываются
+        при его готовности.
+        
+        Args:
+            query (str): Искомый номер
+            max_errors (int): Допустимое число ошибок распознавания (не больше одной)
+            limit (int | None): Максимальное количество результатов
+            wait (bool): Дождаться построения индекса; иначе, пока он строится, возвращается None
+        
+        Returns:
+            list[tuple[str, int]] | None: Номера и число ошибок относительно запроса
+                или None, если индекс ещё строится
+        """
+        if self.plate_index is None:
+            self.start_plate_index()
+            build = self._plate_index_build
+            if wait:
+                build["thread"].join()
+            elif build["thread"].is_alive():
+                return None
+            if build["index"] is None:
+                # Реестр был закрыт во время построения; при следующем поиске индекс строится заново
+                self._plate_index_build = None
+                return []
+            for added, car_number in build["changes"]:
+                if added:
+                    build["index"].add(car_number)
+                else:
+                    build["index"].discard(car_number)
+            self.plate_index = build["index"]
+            self._plate_index_build = None
+        return self.plate_index.search(query, max_errors, limit)
+    
+    def start_plate_index(self) -> None:
+        """Запуск построения индекса номеров в фоновом потоке, если он ещё не построен"""
+        if self.plate_index is not None or self._plate_index_build is not None:
+            return
+        build = {"index": None, "changes": []}
+        build["thread"] = threading.Thread(target=self._build_plate_index, args=(self.snapshot(), build), daemon=True)
+        self._plate_index_build = build
+        build["thread"].start()
+    
+    @staticmethod
+    def _build_plate_index(snapshot, build: dict) -> None:
+        """Построение индекса номеров по неизменяемому снимку реестра (в фоновом потоке)"""
+        index = PlateIndex(max_distance=1)
+        try:
+            for product in snapshot:
+                if product is not None:
+                    index.add(product.car_number)
+        except ValueError:
+            # Файл ленивого списка закрыт: реестр заменён, индекс не нужен
+            return
+        build["index"] = index
+    
+    def get_product(self, index: int) -> CarPassBase | None:
+        """
+        Получение записи по индексу без копирования списка
+        
+        Args:
+            index (int): Индекс записи
+        
+        Returns:
+            CarPassBase | None: Запись или None для невалидной строки ленивого списка
+        """
+        return self.car_passes[index]
+    
+    def count_products(self) -> int:
+        """Получение количества записей"""
+        return len(self.car_passes)
     
     def get_products(self) -> list[CarPassBase]:
         """Получение копии списка записей"""
         return self.car_passes.copy()
+    
+    def snapshot(self) -> CarPassVector | LazyCarPassList:
+        """
+        Получение неизменяемого снимка записей за O(1)
+        
+        Повторные вызовы без изменений между ними возвращают один и тот же
+        снимок. В снимке ленивого списка, снятом до окончания фоновой проверки,
+        невалидные строки возвращаются как None.
+        
+        Returns:
+            CarPassVector | LazyCarPassList: Снимок текущей версии реестра
+        """
+        if self._snapshot is None:
+            self._snapshot = self.car_passes.snapshot()
+        return self._snapshot
+    
+    def refresh(self) -> None:
+        """
+        Переход к новой версии после изменения записей вне менеджера
+        (ленивый список исключил невалидные строки после фоновой проверки)
+        """
+        self._changed()
+        self.plate_index = None
+        self._plate_index_build = None
+    
+    def close(self) -> None:
+        """Освобождение файла и фонового потока ленивого списка"""
+        self._close_products()
+    
+    def _close_products(self) -> None:
+        """Закрытие заменяемого ленивого списка"""
+        if isinstance(self.car_passes, LazyCarPassList):
+            self.car_passes.close()
+    
+    def _changed(self) -> None:
+        """Переход к новой версии реестра"""
+        self.version += 1
+        self._snapshot = None
 
 class ProductTableModel(QAbstractTableModel):
     """Модель Qt для отображения записей о проездах в таблице"""
@@ -88,7 +285,7 @@ class ProductTableModel(QAbstractTableModel):
     
     def rowCount(self, parent=None) -> int:
         """Получение количества строк"""
-        return len(self.product_manager.get_products())
+        return self.product_manager.count_products()
     
     def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole) -> str|None:
         """
@@ -104,9 +301,11 @@ class ProductTableModel(QAbstractTableModel):
         if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
             return None
         
-        product = self.product_manager.get_products()[index.row()]
+        product = self.product_manager.get_product(index.row())
         
-        if index.column() == 0:
+        if product is None:
+            return None
+        elif index.column() == 0:
             return product.pass_date.date().strftime("%Y-%m-%d")
         elif index.column() == 1:
             return product.car_number
@@ -128,6 +327,21 @@ class ProductTableModel(QAbstractTableModel):
         if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
             return self.headers[section]
         return None
+    
+    def append_products(self, products: list[CarPassBase]) -> None:
+        """
+        Добавление записей в конец таблицы с уведомлением о вставке строк
+        
+        Args:
+            products (list[CarPassBase]): Новые записи
+        """
+        if not products:
+            return
+        first = self.product_manager.count_products()
+        self.beginInsertRows(QModelIndex(), first, first + len(products) - 1)
+        for product in products:
+            self.product_manager.add_product(product)
+        self.endInsertRows()
 
 class ProductFormManager:
     """Класс для управления полями формы ввода данных о проезде"""
@@ -174,56 +388,226 @@ class ProductFormManager:
 class ProductFileHandler:
     """Класс для обработки сохранения и загрузки записей о проездах"""
     
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, cache: ParsedResultCache | None = None):
+        """
+        Инициализация обработчика файлов
+        
+        Args:
+            logger (Logger): Логгер для ошибок
+            cache (ParsedResultCache | None): Кэш результатов разбора несжатых файлов
+        """
         self.logger = logger
+        self.cache = cache
+        self.record_hooks = []
+        self.batch_hooks = []
     
-    def save_products(self, products: list[CarPassBase], filename: str) -> None:
+    def add_record_hook(self, hook) -> None:
+        """
+        Добавление обработчика, вызываемого для каждой загруженной записи
+        
+        Args:
+            hook: Функция hook(product), например Watchlist.check
+        """
+        self.record_hooks.append(hook)
+    
+    def add_batch_hook(self, hook) -> None:
+        """
+        Добавление обработчика, вызываемого один раз для всех загруженных записей
+        
+        Args:
+            hook: Функция hook(products), например FuelAnomalyDetector.check_many
+        """
+        self.batch_hooks.append(hook)
+    
+    def _run_hooks(self, products: list[CarPassBase]) -> None:
+        """Вызов обработчиков для загруженных записей"""
+        for hook in self.record_hooks:
+            for product in products:
+                hook(product)
+        for hook in self.batch_hooks:
+            hook(products)
+    
+    def save_products(self, products: list[CarPassBase], filename: str, rollups: PassRollups | None = None) -> None:
         """
         Сохранение записей о проездах в файл
         
+        Файлы с расширением .gz, .bz2 или .xz сжимаются при записи.
+        Записи пишутся во временный файл рядом с целевым, который затем
+        атомарно заменяет его, поэтому снимок ленивого списка можно
+        сохранить в тот же файл, из которого он читается.
+        Рядом с реестром сохраняется файл агрегатов (см. PassRollups).
+        
         Args:
-            products (list[CarPassBase]): Список записей
+            products (list[CarPassBase]): Список записей или снимок реестра
             filename (str): Путь к файлу
+            rollups (PassRollups | None): Агрегаты по записям, если они уже посчитаны
         """
-        with open(filename, 'w', encoding='utf-8') as file:
-            for product in products:
-                file.write(str(product) + "\n")
+        collect_rollups = rollups is None
+        if collect_rollups:
+            rollups = PassRollups()
+        directory, name = os.path.split(os.path.abspath(filename))
+        root, extension = os.path.splitext(name)
+        # Расширение сохраняется, чтобы временный файл сжимался так же, как целевой
+        temp_filename = os.path.join(directory, f".{root}.{os.getpid()}.tmp{extension}")
+        try:
+            with open_text_file(temp_filename, 'w') as file:
+                for product in products:
+                    # Невалидные строки снимка ленивого списка не сохраняются
+                    if product is None:
+                        continue
+                    file.write(str(product) + "\n")
+                    if collect_rollups:
+                        rollups.add(product)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            # Временного файла может не быть, если его не удалось создать
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_filename)
+            raise
+        rollups.save(filename)
+    
+    def append_products(self, products: list[CarPassBase], filename: str) -> None:
+        """
+        Дозапись записей о проездах в конец файла
+        
+        В отличие от save_products файл не перезаписывается, поэтому
+        несколько процессов могут дописывать записи в один реестр. Файл
+        агрегатов читается и обновляется под той же блокировкой, что и
+        дозапись, поэтому отметка размера реестра в нём соответствует
+        записанным агрегатам.
+        
+        Args:
+            products (list[CarPassBase]): Список новых записей
+            filename (str): Путь к файлу
+        """
+        with AppendWriter(filename) as writer, writer.lock():
+            rollups = PassRollups.load(filename) if os.path.getsize(filename) else PassRollups()
+            writer.write_many(products)
+            writer.flush()
+            # Если агрегаты устарели, они будут перестроены при следующем чтении
+            if rollups is not None:
+                for product in products:
+                    rollups.add(product)
+                rollups.save(filename)
     
-    def load_products(self, filename: str) -> list[CarPassBase]:
+    def load_products(self, filename: str, report: LoadReport | None = None) -> list[CarPassBase]:
         """
         Загрузка записей о проездах из файла
         
+        Сжатые файлы (gzip, bzip2, xz) распаковываются потоково при чтении.
+        Вместо файла можно указать каталог секционированного хранилища.
+        
+        Ошибочные строки собираются в сводку, которая пишется в лог одной
+        записью. Если у сводки задан error_budget и он превышен, загрузка
+        прерывается исключением ErrorBudgetExceeded.
+        
+        Для каждой загруженной записи вызываются обработчики record_hooks,
+        для всех записей сразу - batch_hooks.
+        
         Args:
             filename (str): Путь к файлу
+            report (LoadReport | None): Сводка загрузки, заполняемая для вызывающего кода
             
         Returns:
             list[CarPassBase]: Список записей
         """
-        products = []
-        car_number_pattern = re.compile(r'^[АВЕКМНОРСТУХ]\d{3}[АВЕКМНОРСТУХ]{2}\d{2,3}$')
-        current_date = datetime.datetime.now()
-        
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line_number, line in enumerate(file, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    date_str, car_number, fuel_str = line.split(',')
-                    # Валидация даты
-                    pass_date = datetime.datetime.strptime(date_str, '%Y-%m-%d')
-                    if pass_date > current_date:
-                        raise ValueError(f"Дата проезда позднее текущей: {date_str}")
-                    # Валидация номера автомобиля
-                    if not car_number_pattern.match(car_number):
-                        raise ValueError(f"Неверный формат номера автомобиля: {car_number}. Допустимы только буквы: А, В, Е, К, М, Н, О, Р, С, Т, У, Х")
-                    # Валидация расхода топлива
-                    fuel_consumption = float(fuel_str)
-                    if fuel_consumption <= 0:
-                        raise ValueError(f"Неверный расход топлива: {fuel_consumption}")
-                    products.append(CarPass(pass_date, car_number, fuel_consumption))
-                except Exception as e:
-                    self.logger.log_message("ОШИБКА", f"Не удалось разобрать строку {line_number}: {line}. Ошибка: {str(e)}")
+        products = self._read_products(filename, report)
+        self._run_hooks(products)
+        return products
+    
+    def _read_products(self, filename: str, report: LoadReport | None = None) -> list[CarPassBase]:
+        """Чтение и проверка записей файла без вызова обработчиков"""
+        if report is None:
+            report = LoadReport()
+        if PartitionedStorage.is_partitioned(filename):
+            products = PartitionedStorage(filename, logger=self.logger).load_products(report=report)
+        elif self.cache is not None and detect_compression(filename) is None:
+            products = self.cache.load_products(filename, CarPassParser(), report)
+        else:
+            products = []
+            parser = CarPassParser()
+            
+            with open_text_file(filename, 'r') as file:
+                for line_number, line in enumerate(file, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        products.append(parser.parse_line(line))
+                    except Exception as e:
+                        report.record_rejected(line_number, line, e)
+            report.record_accepted(len(products))
+        if report.rejected:
+            self.logger.log_message("ОШИБКА", f"При загрузке файла {filename} отклонены строки. {report.summary()}")
+        return products
+    
+    def load_rollups(self, filename: str) -> PassRollups:
+        """
+        Загрузка агрегатов реестра; при отсутствии или повреждении файла
+        агрегатов они перестраиваются по реестру и сохраняются
+        
+        Args:
+            filename (str): Путь к файлу реестра
+            
+        Returns:
+            PassRollups: Агрегаты
+        """
+        rollups = PassRollups.load(filename)
+        if rollups is None:
+            self.logger.log_message("ПРЕДУПРЕЖДЕНИЕ", f"Агрегаты для файла {filename} отсутствуют или устарели, выполняется перестроение")
+            rollups = PassRollups.from_products(self._read_products(filename))
+            rollups.save(filename)
+        return rollups
+    
+    def load_products_range(self, filename: str, start: datetime.date | None, end: datetime.date | None) -> list[CarPassBase]:
+        """
+        Загрузка записей за период
+        
+        Для секционированного хранилища читаются только секции, пересекающиеся
+        с периодом; обычный файл читается целиком. Обработчики record_hooks
+        и batch_hooks вызываются для записей, попавших в период.
+        
+        Args:
+            filename (str): Путь к файлу или каталогу хранилища
+            start (datetime.date | None): Начало периода включительно
+            end (datetime.date | None): Конец периода включительно
+            
+        Returns:
+            list[CarPassBase]: Список записей
+        """
+        if PartitionedStorage.is_partitioned(filename):
+            report = LoadReport()
+            products = PartitionedStorage(filename, logger=self.logger).load_products(start, end, report)
+            if report.rejected:
+                self.logger.log_message("ОШИБКА", f"При загрузке файла {filename} отклонены строки. {report.summary()}")
+        else:
+            products = [product for product in self._read_products(filename)
+                        if (start is None or product.pass_date.date() >= start)
+                        and (end is None or product.pass_date.date() <= end)]
+        self._run_hooks(products)
+        return products
+    
+    def load_products_lazy(self, filename: str, cache_size: int = 4096) -> list[CarPassBase] | LazyCarPassList:
+        """
+        Ленивая загрузка записей: строки разбираются при первом обращении,
+        остальные проверяются в фоновом потоке
+        
+        Сжатые файлы не поддерживают быстрый переход по смещению, поэтому
+        загружаются обычным способом. Обработчики record_hooks и batch_hooks для записей
+        ленивого списка не вызываются: это потребовало бы разобрать весь файл
+        сразу; для проверки всех записей используйте load_products.
+        
+        Args:
+            filename (str): Путь к файлу
+            cache_size (int): Размер кэша разобранных записей
+            
+        Returns:
+            list[CarPassBase] | LazyCarPassList: Список записей
+        """
+        if detect_compression(filename) is not None:
+            return self.load_products(filename)
+        products = LazyCarPassList(filename, CarPassParser(), self.logger, cache_size)
+        products.start_validation()
         return products
 
 class ProductWindow(QMainWindow):
@@ -238,7 +622,31 @@ class ProductWindow(QMainWindow):
         # Инициализация компонентов
         self.product_manager = ProductManager()
         self.logger = Logger()
-        self.file_handler = ProductFileHandler(self.logger)
+        self.file_handler = ProductFileHandler(self.logger, ParsedResultCache())
+        
+        # Список розыска проверяется при загрузке файлов и добавлении записей
+        self.watchlist = Watchlist(self.logger)
+        if os.path.exists(WATCHLIST_FILENAME):
+            self.watchlist.load(WATCHLIST_FILENAME)
+        self.file_handler.add_record_hook(self.watchlist.check)
+        self.product_manager.add_record_hook(self.watchlist.check)
+        
+        # Поиск аномального расхода топлива по истории каждого автомобиля
+        self.anomaly_detector = FuelAnomalyDetector(logger=self.logger)
+        self.file_handler.add_batch_hook(self.anomaly_detector.check_many)
+        self.product_manager.add_record_hook(self.anomaly_detector.check)
+        self.follower = None
+        self.follow_timer = QTimer(self)
+        self.follow_timer.setInterval(1000)
+        self.follow_timer.timeout.connect(self.poll_followed_file)
+        # Ожидание конца фоновой проверки ленивого списка
+        self.validation_timer = QTimer(self)
+        self.validation_timer.setInterval(200)
+        self.validation_timer.timeout.connect(self.poll_validation)
+        # Повтор поиска номера, пока индекс номеров строится в фоне
+        self.search_timer = QTimer(self)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(lambda: self.search_plates(self.search_edit.text()))
         
         # Создание интерфейса
         self.init_ui()
@@ -283,6 +691,17 @@ class ProductWindow(QMainWindow):
         self.load_button.clicked.connect(self.load_products)
         button_layout.addWidget(self.load_button)
         
+        # Кнопка быстрого просмотра (ленивая загрузка)
+        self.preview_button = QPushButton("Быстрый просмотр")
+        self.preview_button.clicked.connect(self.preview_products)
+        button_layout.addWidget(self.preview_button)
+        
+        # Кнопка отслеживания дописываемого файла
+        self.follow_button = QPushButton("Следить за файлом")
+        self.follow_button.setCheckable(True)
+        self.follow_button.toggled.connect(self.toggle_follow)
+        button_layout.addWidget(self.follow_button)
+        
         # Кнопка сохранения
         self.save_button = QPushButton("Сохранить данные")
         self.save_button.clicked.connect(self.save_products)
@@ -294,13 +713,25 @@ class ProductWindow(QMainWindow):
         button_layout.addWidget(self.delete_button)
         
         layout.addLayout(button_layout)
+        
+        # Нечёткий поиск номера (допускается одна ошибка распознавания)
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Поиск номера, например А123ВЕ77")
+        self.search_edit.textChanged.connect(self.search_plates)
+        search_layout.addWidget(self.search_edit)
+        self.search_results = QLabel()
+        search_layout.addWidget(self.search_results, 1)
+        layout.addLayout(search_layout)
     
     def add_product(self) -> None:
         """Добавление новой записи о проезде на основе данных формы"""
         car_number, fuel_consumption = self.form_manager.get_form_values()
         
         # Валидация номера автомобиля
-        car_number_pattern = re.compile(r'^[АВЕКМНОРСТУХ]\d{3}[АВЕКМНОРСТУХ]{2}\d{2,3}$')
+        parser = CarPassParser()
+        car_number = parser.normalize_car_number(car_number)
+        car_number_pattern = parser.car_number_pattern
         if not car_number:
             QMessageBox.warning(self, "Предупреждение", "Номер автомобиля не может быть пустым!")
             self.logger.log_message("ПРЕДУПРЕЖДЕНИЕ", "Попытка добавить запись с пустым номером автомобиля")
@@ -326,7 +757,7 @@ class ProductWindow(QMainWindow):
             self.logger.log_message("ПРЕДУПРЕЖДЕНИЕ", f"Дата проезда позднее текущей: {pass_date.strftime('%Y-%m-%d')}")
             return
         
-        product = CarPass(pass_date, car_number, fuel_consumption)
+        product = CarPass(pass_date, parser.intern_car_number(car_number), fuel_consumption)
         self.product_manager.add_product(product)
         self.table_model.layoutChanged.emit()
     
@@ -351,33 +782,128 @@ class ProductWindow(QMainWindow):
     def save_products(self) -> None:
         """Сохранение записей о проездах в файл"""
         filename, _ = QFileDialog.getSaveFileName(
-            None, "Сохранить файл", ".", "Текстовые файлы (*.txt);;Все файлы (*)"
+            None, "Сохранить файл", ".", "Текстовые файлы (*.txt);;Сжатые файлы (*.gz *.bz2 *.xz);;Все файлы (*)"
         )
         if filename:
             self.file_handler.save_products(
-                self.product_manager.get_products(),
-                filename
+                self.product_manager.snapshot(),
+                filename,
+                self.product_manager.rollups
             )
     
     def load_products(self) -> None:
         """Загрузка записей о проездах из файла"""
         filename, _ = QFileDialog.getOpenFileName(
-            None, "Открыть файл", ".", "Текстовые файлы (*.txt);;Все файлы (*)"
+            None, "Открыть файл", ".", "Текстовые файлы (*.txt);;Сжатые файлы (*.gz *.bz2 *.xz);;Все файлы (*)"
         )
         if filename:
             try:
-                products = self.file_handler.load_products(filename)
-                self.product_manager.clear_products()
-                for product in products:
-                    self.product_manager.add_product(product)
+                report = LoadReport()
+                # Загруженный файл заменяет записи, поэтому и история расхода начинается заново
+                self.anomaly_detector.reset()
+                products = self.file_handler.load_products(filename, report)
+                self.product_manager.replace_products(products)
                 self.table_model.layoutChanged.emit()
-                QMessageBox.information(self, "Успех", "Данные успешно загружены!")
+                message = "Данные успешно загружены!"
+                if report.rejected:
+                    message += f"\n{report.summary()}"
+                QMessageBox.information(self, "Успех", message)
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить файл: {str(e)}")
                 self.logger.log_message("ОШИБКА", f"Не удалось загрузить файл: {str(e)}")
 
+    def preview_products(self) -> None:
+        """Быстрое открытие файла: строки разбираются только при отображении"""
+        filename, _ = QFileDialog.getOpenFileName(
+            None, "Открыть файл", ".", "Текстовые файлы (*.txt);;Сжатые файлы (*.gz *.bz2 *.xz);;Все файлы (*)"
+        )
+        if filename:
+            try:
+                self.anomaly_detector.reset()
+                products = self.file_handler.load_products_lazy(filename)
+                self.product_manager.replace_products(products, PassRollups.load(filename))
+                self.table_model.layoutChanged.emit()
+                if isinstance(products, LazyCarPassList):
+                    self.validation_timer.start()
+            except Exception as e:
+                QMessageBox.critical(self, "Ошибка", f"Не удалось открыть файл: {str(e)}")
+                self.logger.log_message("ОШИБКА", f"Не удалось открыть файл: {str(e)}")
+
+    def toggle_follow(self, checked: bool) -> None:
+        """
+        Включение и выключение режима отслеживания файла
+        
+        Args:
+            checked (bool): Состояние кнопки отслеживания
+        """
+        if not checked:
+            self.follow_timer.stop()
+            if self.follower is not None:
+                self.follower.close()
+                self.follower = None
+            return
+        
+        filename, _ = QFileDialog.getOpenFileName(
+            None, "Открыть файл", ".", "Текстовые файлы (*.txt);;Все файлы (*)"
+        )
+        if not filename:
+            self.follow_button.setChecked(False)
+            return
+        self.table_model.beginResetModel()
+        self.product_manager.clear_products()
+        self.anomaly_detector.reset()
+        self.table_model.endResetModel()
+        self.follower = SupplyFileFollower(filename, CarPassParser(), self.logger)
+        self.poll_followed_file()
+        self.follow_timer.start()
+    
+    def poll_validation(self) -> None:
+        """Обновление таблицы, когда ленивый список исключил невалидные строки"""
+        products = self.product_manager.car_passes
+        if not isinstance(products, LazyCarPassList):
+            self.validation_timer.stop()
+        elif products.validation_finished.is_set():
+            self.validation_timer.stop()
+            self.product_manager.refresh()
+            self.table_model.layoutChanged.emit()
+    
+    def poll_followed_file(self) -> None:
+        """Добавление в таблицу строк, дописанных в отслеживаемый файл"""
+        if self.follower is not None:
+            self.table_model.append_products(self.follower.poll())
+
+    def search_plates(self, text: str) -> None:
+        """
+        Вывод номеров, похожих на введённый
+        
+        Args:
+            text (str): Текст поля поиска
+        """
+        query = CarPassParser().normalize_car_number(text)
+        if not query:
+            self.search_timer.stop()
+            self.search_results.setText("")
+            return
+        results = self.product_manager.search_plates(query, max_errors=1, limit=SEARCH_RESULTS_LIMIT, wait=False)
+        if results is None:
+            self.search_results.setText("Построение индекса номеров...")
+            self.search_timer.start()
+            return
+        self.search_timer.stop()
+        self.search_results.setText(", ".join(f"{car_number} ({errors})" for car_number, errors in results) or "Не найдено")
+
+    def closeEvent(self, event) -> None:
+        """Освобождение файлов при закрытии окна"""
+        self.follow_timer.stop()
+        self.validation_timer.stop()
+        self.search_timer.stop()
+        if self.follower is not None:
+            self.follower.close()
+        self.product_manager.close()
+        super().closeEvent(event)
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = ProductWindow()
     window.show()
-    sys.exit(app.exec())
+    sys.exit(app.exec())
\ No newline at end of file
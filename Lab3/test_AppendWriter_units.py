@@ -0,0 +1,117 @@
+import unittest
+import os
+import datetime
+import multiprocessing
+from unittest.mock import MagicMock
+from CarPass import CarPass
+from AppendWriter import AppendWriter
+from PassRollups import PassRollups
+from file_utils import open_text_file
+from main import ProductFileHandler
+
+WRITERS = 4
+RECORDS_PER_WRITER = 2000
+
+def write_records(filename: str, writer_id: int) -> None:
+    """Запись тестовых записей одним процессом; расход топлива кодирует номер записи"""
+    with AppendWriter(filename, group_size=64) as writer:
+        for number in range(RECORDS_PER_WRITER):
+            writer.write(CarPass(datetime.datetime(2023, 1, 2), f"А{number % 1000:03d}ВК{10 + writer_id}", number + 1))
+
+def append_with_rollups(filename: str, writer_id: int) -> None:
+    """Дозапись тестовых записей небольшими порциями с обновлением агрегатов"""
+    file_handler = ProductFileHandler(MagicMock())
+    for number in range(50):
+        file_handler.append_products([CarPass(datetime.datetime(2023, 1, 2), f"А{number:03d}ВК{10 + writer_id}", 1.0)], filename)
+
+class TestAppendWriter(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_file = "temp_append_file.txt"
+        self.product = CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", 7.5)
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        for filename in (self.temp_file, PassRollups.side_filename(self.temp_file),
+                         self.temp_file + ".gz", PassRollups.side_filename(self.temp_file + ".gz"),
+                         self.temp_file + ".xz", PassRollups.side_filename(self.temp_file + ".xz")):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def test_group_commit(self):
+        """Тестирование фиксации записей группами"""
+        writer = AppendWriter(self.temp_file, group_size=2)
+        writer.write(self.product)
+        self.assertEqual(os.path.getsize(self.temp_file), 0)
+        writer.write(self.product)
+        self.assertEqual(os.path.getsize(self.temp_file), 2 * len(str(self.product).encode('utf-8') + b"\n"))
+        writer.write(self.product)
+        writer.close()
+        with open(self.temp_file, encoding='utf-8') as file:
+            self.assertEqual(file.read(), (str(self.product) + "\n") * 3)
+
+    def test_append_products_keeps_existing(self):
+        """Тестирование дозаписи без потери имеющихся записей"""
+        file_handler = ProductFileHandler(MagicMock())
+        file_handler.save_products([self.product], self.temp_file)
+        file_handler.append_products([self.product], self.temp_file)
+        self.assertEqual(len(file_handler.load_products(self.temp_file)), 2)
+
+    def test_append_to_compressed_file(self):
+        """Тестирование дозаписи в сжатые файлы"""
+        file_handler = ProductFileHandler(MagicMock())
+        for filename in (self.temp_file + ".gz", self.temp_file + ".xz"):
+            file_handler.save_products([self.product], filename)
+            file_handler.append_products([self.product], filename)
+            file_handler.append_products([self.product, self.product], filename)
+            with open_text_file(filename) as file:
+                self.assertEqual(file.read(), (str(self.product) + "\n") * 4)
+
+    def test_two_writers_open_new_compressed_file(self):
+        """Тестирование двух писателей, открывших ещё пустой сжатый файл"""
+        filename = self.temp_file + ".gz"
+        first = AppendWriter(filename, group_size=1)
+        second = AppendWriter(filename, group_size=1)
+        first.write(self.product)
+        second.write(self.product)
+        first.close()
+        second.close()
+        with open_text_file(filename) as file:
+            self.assertEqual(file.read(), (str(self.product) + "\n") * 2)
+
+    def test_concurrent_writers_lose_nothing(self):
+        """Стресс-тест: несколько процессов дописывают в один файл"""
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=write_records, args=(self.temp_file, writer_id))
+                     for writer_id in range(WRITERS)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+
+        logger = MagicMock()
+        products = ProductFileHandler(logger).load_products(self.temp_file)
+        logger.log_message.assert_not_called()
+        self.assertEqual(len(products), WRITERS * RECORDS_PER_WRITER)
+        for writer_id in range(WRITERS):
+            numbers = sorted(p.fuel_consumption for p in products if p.car_number.endswith(str(10 + writer_id)))
+            self.assertEqual(numbers, list(range(1, RECORDS_PER_WRITER + 1)))
+
+    def test_concurrent_appends_keep_rollups_valid(self):
+        """Стресс-тест: агрегаты, обновляемые несколькими процессами, совпадают с реестром"""
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=append_with_rollups, args=(self.temp_file, writer_id))
+                     for writer_id in range(WRITERS)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+        rollups = PassRollups.load(self.temp_file)
+        self.assertIsNotNone(rollups)
+        self.assertEqual(rollups.daily_passes("2023-01-02"), WRITERS * 50)
+        self.assertEqual(len(rollups.monthly_report("2023-01")), WRITERS * 50)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import datetime
+import random
+import threading
+from CarPass import CarPass
+from CarPassVector import CarPassVector
+from main import ProductManager
+
+def make_pass(i: int) -> CarPass:
+    return CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", 1.0 + i)
+
+class TestCarPassVector(unittest.TestCase):
+    def test_matches_list_with_snapshots(self):
+        """Тестирование совпадения со списком и неизменности снимков при случайных изменениях"""
+        rng = random.Random(1)
+        vector = CarPassVector()
+        expected = []
+        snapshots = []
+        for i in range(5000):
+            if expected and rng.random() < 0.3:
+                index = rng.randrange(len(expected))
+                del vector[index]
+                del expected[index]
+            else:
+                product = make_pass(i)
+                vector.append(product)
+                expected.append(product)
+            if rng.random() < 0.01:
+                snapshots.append((vector.snapshot(), list(expected)))
+        self.assertEqual(list(vector), expected)
+        self.assertEqual(vector[len(expected) // 2], expected[len(expected) // 2])
+        for snapshot, state in snapshots:
+            self.assertEqual(len(snapshot), len(state))
+            self.assertEqual(list(snapshot), state)
+            self.assertIs(snapshot[-1], state[-1])
+
+    def test_snapshot_is_read_only(self):
+        """Тестирование запрета изменения снимка"""
+        snapshot = CarPassVector([make_pass(0)]).snapshot()
+        with self.assertRaises(TypeError):
+            snapshot.append(make_pass(1))
+        with self.assertRaises(TypeError):
+            del snapshot[0]
+
+    def test_concurrent_reader(self):
+        """Тестирование чтения снимка в другом потоке во время изменения списка"""
+        manager = ProductManager()
+        manager.replace_products([make_pass(i) for i in range(10000)])
+        snapshot = manager.snapshot()
+        results = []
+        reader = threading.Thread(target=lambda: results.append(sum(p.fuel_consumption for p in snapshot)))
+        reader.start()
+        for i in range(2000):
+            manager.add_product(make_pass(i))
+            manager.delete_product(0)
+        reader.join()
+        self.assertEqual(results, [sum(1.0 + i for i in range(10000))])
+
+    def test_manager_snapshot_versions(self):
+        """Тестирование повторного использования снимка до изменения реестра"""
+        manager = ProductManager()
+        manager.add_product(make_pass(0))
+        first = manager.snapshot()
+        self.assertIs(manager.snapshot(), first)
+        manager.add_product(make_pass(1))
+        second = manager.snapshot()
+        self.assertIsNot(second, first)
+        self.assertEqual((len(first), len(second), manager.version), (1, 2, 2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import datetime
+import random
+import statistics
+from unittest.mock import MagicMock
+from CarPass import CarPass
+from FuelAnomalyDetector import FuelAnomalyDetector
+
+class TestFuelAnomalyDetector(unittest.TestCase):
+    def test_detects_sudden_deviation(self):
+        """Тестирование обнаружения резкого отклонения расхода"""
+        on_anomaly = MagicMock()
+        detector = FuelAnomalyDetector(window=10, threshold=3.0, min_samples=5, on_anomaly=on_anomaly)
+        rng = random.Random(3)
+        for _ in range(30):
+            self.assertFalse(detector.check(CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", 8.0 + rng.uniform(-0.3, 0.3))))
+        faulty = CarPass(datetime.datetime(2023, 1, 3), "А123ВК78", 25.0)
+        self.assertTrue(detector.check(faulty))
+        on_anomaly.assert_called_once()
+        self.assertIs(on_anomaly.call_args[0][0], faulty)
+        self.assertAlmostEqual(on_anomaly.call_args[0][1], 8.0, delta=0.3)
+
+    def test_history_is_per_plate_and_bounded(self):
+        """Тестирование раздельной истории номеров и ограниченного окна"""
+        detector = FuelAnomalyDetector(window=5, min_samples=3)
+        for _ in range(100):
+            detector.update("А123ВК78", 8.0)
+            detector.update("В456КМ12", 20.0)
+        self.assertEqual(len(detector), 2)
+        self.assertIsNone(detector.update("В456КМ12", 20.2))
+        self.assertIsNotNone(detector.update("А123ВК78", 20.0))
+        mean, m2, count, _, values = detector._states["А123ВК78"]
+        self.assertEqual((count, len(values)), (5, 5))
+        self.assertAlmostEqual(mean, statistics.fmean(values))
+        self.assertAlmostEqual(m2 / count, statistics.pvariance(values))
+
+    def test_long_stream_does_not_drift(self):
+        """Тестирование точности среднего и отклонения на длинном потоке"""
+        detector = FuelAnomalyDetector(window=20)
+        rng = random.Random(5)
+        for _ in range(200000):
+            detector.update("А123ВК78", 1e6 + rng.uniform(-1.0, 1.0))
+        for _ in range(20):
+            detector.update("А123ВК78", 8.0 + rng.uniform(-0.1, 0.1))
+        mean, m2, count, _, values = detector._states["А123ВК78"]
+        self.assertAlmostEqual(mean, statistics.fmean(values), places=6)
+        self.assertAlmostEqual(m2 / count, statistics.pvariance(values), places=6)
+
+    def test_batch_matches_single_updates(self):
+        """Тестирование совпадения пакетной и поштучной обработки"""
+        rng = random.Random(7)
+        products = [CarPass(datetime.datetime(2023, 1, 2), rng.choice(["А123ВК78", "В456КМ12"]),
+                            rng.gauss(8.0, 0.5) if rng.random() > 0.05 else 30.0) for _ in range(2000)]
+        single = FuelAnomalyDetector()
+        expected = [product for product in products if single.check(product)]
+        found = FuelAnomalyDetector().check_many(products)
+        self.assertTrue(expected)
+        self.assertEqual(found, expected)
+
+    def test_reset_forgets_history(self):
+        """Тестирование сброса истории перед повторной загрузкой"""
+        detector = FuelAnomalyDetector(min_samples=3)
+        for _ in range(5):
+            detector.update("А123ВК78", 8.0)
+        detector.reset()
+        self.assertEqual(len(detector), 0)
+        self.assertIsNone(detector.update("А123ВК78", 40.0))
+
+    def test_no_check_before_min_samples(self):
+        """Тестирование отсутствия проверки до накопления истории"""
+        logger = MagicMock()
+        detector = FuelAnomalyDetector(min_samples=3, logger=logger)
+        for value in (5.0, 5.0, 40.0):
+            detector.check(CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", value))
+        logger.log_message.assert_not_called()
+        detector.check(CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", 400.0))
+        logger.log_message.assert_called_once_with("АНОМАЛИЯ", unittest.mock.ANY)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import asyncio
+import os
+from unittest.mock import MagicMock
+from AppendWriter import AppendWriter
+from IngestionService import IngestionService, generate_load, send_events
+from main import ProductFileHandler, ProductManager
+
+class TestIngestionService(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_file = "temp_ingest_file.txt"
+        self.logger = MagicMock()
+        self.manager = ProductManager()
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        if os.path.exists(self.temp_file):
+            os.remove(self.temp_file)
+
+    def test_errors_are_reported_per_connection(self):
+        """Тестирование ответа об ошибочных строках и итоговой строки"""
+        async def scenario():
+            service = IngestionService(self.manager, self.logger)
+            port = await service.start()
+            replies = await send_events("127.0.0.1", port, ["2023-01-02,А123ВК78,7.5", "2023-01-02,InvalidNumber,7.5",
+                                                            "2023-01-03,В456КМ12,8.2"])
+            await service.stop()
+            return replies
+        replies = asyncio.run(scenario())
+        self.assertEqual(len(replies), 2)
+        self.assertTrue(replies[0].startswith("ERR 2 "))
+        self.assertEqual(replies[1], "DONE 2 1")
+        self.assertEqual(self.manager.count_products(), 2)
+        self.logger.log_message.assert_called_once_with("ОШИБКА", unittest.mock.ANY)
+
+    def test_udp_events(self):
+        """Тестирование приёма событий по UDP"""
+        async def scenario():
+            service = IngestionService(self.manager, self.logger)
+            await service.start(udp_port=0)
+            port = service._transports[0].get_extra_info('sockname')[1]
+            transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                asyncio.DatagramProtocol, remote_addr=("127.0.0.1", port))
+            transport.sendto("2023-01-02,А123ВК78,7.5\n2023-01-03,В456КМ12,8.2\n".encode('utf-8'))
+            for _ in range(100):
+                if self.manager.count_products() == 2:
+                    break
+                await asyncio.sleep(0.01)
+            transport.close()
+            await service.stop()
+        asyncio.run(scenario())
+        self.assertEqual(self.manager.count_products(), 2)
+
+    def test_throughput_on_localhost(self):
+        """Тестирование пропускной способности: все события попадают в менеджер и файл"""
+        count = 20000
+
+        async def scenario():
+            service = IngestionService(self.manager, self.logger, AppendWriter(self.temp_file, sync=False),
+                                       queue_size=1000)
+            port = await service.start()
+            rate = await generate_load("127.0.0.1", port, count, connections=4)
+            await service.stop()
+            service.writer.close()
+            return rate
+        rate = asyncio.run(scenario())
+        self.assertGreater(rate, 0)
+        self.assertEqual(self.manager.count_products(), count)
+        self.assertEqual(len(ProductFileHandler(self.logger).load_products(self.temp_file)), count)
+        self.logger.log_message.assert_not_called()
+
+    def test_too_long_line_closes_connection(self):
+        """Тестирование закрытия соединения при слишком длинной строке"""
+        async def scenario():
+            service = IngestionService(self.manager, self.logger)
+            port = await service.start()
+            replies = await send_events("127.0.0.1", port, ["2023-01-02,А123ВК78,7.5", "1" * (service.line_limit + 1)])
+            await service.stop()
+            return replies
+        replies = asyncio.run(scenario())
+        self.assertEqual(len(replies), 1)
+        self.assertTrue(replies[0].startswith("ERR 2 "))
+        self.assertEqual(self.manager.count_products(), 1)
+        self.logger.log_message.assert_called_once_with("ОШИБКА", unittest.mock.ANY)
+
+    def test_failed_write_does_not_stop_service(self):
+        """Тестирование продолжения приёма после ошибки записи пакета"""
+        writer = MagicMock()
+        writer.flush.side_effect = [OSError("Нет места на диске"), None, None]
+
+        async def scenario():
+            service = IngestionService(self.manager, self.logger, writer)
+            port = await service.start()
+            await send_events("127.0.0.1", port, ["2023-01-02,А123ВК78,7.5"])
+            await send_events("127.0.0.1", port, ["2023-01-03,В456КМ12,8.2"])
+            await asyncio.wait_for(service.stop(), 5)
+        asyncio.run(scenario())
+        self.assertEqual(self.manager.count_products(), 2)
+        self.logger.log_message.assert_called_once_with("ОШИБКА", unittest.mock.ANY)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import os
+from unittest.mock import MagicMock
+from LoadReport import LoadReport, ErrorBudgetExceeded
+from main import ProductFileHandler
+
+class TestLoadReport(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_file = "temp_load_report.txt"
+        self.logger = MagicMock()
+        with open(self.temp_file, 'w', encoding='utf-8') as file:
+            file.write("2023-01-02,А123ВК78,7.5\n")
+            for i in range(100):
+                file.write(f"2023-01-03,Invalid{i},8.2\n")
+            for i in range(20):
+                file.write(f"2023-13-{i:02},В456КМ12,6.8\n")
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        os.remove(self.temp_file)
+
+    def test_rejects_grouped_by_reason(self):
+        """Тестирование подсчёта ошибок по причинам с ограничением числа примеров"""
+        report = LoadReport(max_examples=3)
+        products = ProductFileHandler(self.logger).load_products(self.temp_file, report)
+        self.assertEqual(len(products), 1)
+        self.assertEqual((report.accepted, report.rejected), (1, 120))
+        self.assertEqual(sorted(report.reasons.values()), [20, 100])
+        self.assertTrue(all(len(examples) == 3 for examples in report.examples.values()))
+        self.assertEqual(report.examples["Неверный формат номера автомобиля"][0][0], 2)
+
+    def test_summary_logged_once(self):
+        """Тестирование записи в лог одной сводки вместо сообщения на каждую строку"""
+        ProductFileHandler(self.logger).load_products(self.temp_file)
+        self.logger.log_message.assert_called_once()
+        self.assertIn("отклонено: 120", self.logger.log_message.call_args[0][1])
+
+    def test_error_budget_aborts_load(self):
+        """Тестирование прерывания загрузки при превышении допустимого числа ошибок"""
+        report = LoadReport(error_budget=10)
+        with self.assertRaises(ErrorBudgetExceeded):
+            ProductFileHandler(self.logger).load_products(self.temp_file, report)
+        self.assertEqual(report.rejected, 11)
+
+    def test_english_summary(self):
+        """Тестирование сводки на английском языке для Lab1 и Lab2"""
+        report = LoadReport(language="en")
+        report.record_accepted()
+        report.record_rejected(2, "2023-01-03,Invalid,8.2", ValueError("bad number"))
+        self.assertIn("Accepted lines: 1, rejected: 1", report.summary())
+        self.assertIn("line 2: '2023-01-03,Invalid,8.2' (bad number)", report.summary())
+        with self.assertRaises(ValueError):
+            LoadReport(language="de")
+
+if __name__ == '__main__':
+    unittest.main()
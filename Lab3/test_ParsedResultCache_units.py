@@ -0,0 +1,120 @@
+import unittest
+import os
+import pickle
+import shutil
+from unittest.mock import MagicMock, patch
+from CarPassParser import CarPassParser
+from LoadReport import LoadReport
+from ParsedResultCache import ParsedResultCache
+from main import ProductFileHandler
+
+class Marker:
+    """Объект, который при распаковке из pickle создаёт файл-метку"""
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def __reduce__(self):
+        return (open, (self.filename, 'w'))
+
+class TestParsedResultCache(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_file = "temp_cached_file.txt"
+        self.cache_dir = "temp_parse_cache"
+        self.logger = MagicMock()
+        with open(self.temp_file, 'w', encoding='utf-8') as file:
+            file.write("2023-01-02,А123ВК78,7.5\n2023-01-03,InvalidNumber,8.2\n2023-01-04,В456КМ12,6.8\n")
+        self.file_handler = ProductFileHandler(self.logger, ParsedResultCache(self.cache_dir))
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        for filename in (self.temp_file, ParsedResultCache.side_filename(self.temp_file), "temp_cache_marker.txt"):
+            if os.path.exists(filename):
+                os.remove(filename)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_unchanged_file_is_not_parsed_again(self):
+        """Тестирование загрузки неизменённого файла из кэша"""
+        first = self.file_handler.load_products(self.temp_file)
+        with patch.object(CarPassParser, 'parse_line') as mock_parse:
+            second = ProductFileHandler(self.logger, ParsedResultCache(self.cache_dir)).load_products(self.temp_file)
+        mock_parse.assert_not_called()
+        self.assertEqual([str(p) for p in second], [str(p) for p in first])
+        self.assertEqual(len(second), 2)
+
+    def test_cached_rejects_are_reported(self):
+        """Тестирование сводки об отклонённых строках при загрузке из кэша"""
+        self.file_handler.load_products(self.temp_file)
+        report = LoadReport()
+        ProductFileHandler(self.logger, ParsedResultCache(self.cache_dir)).load_products(self.temp_file, report)
+        self.assertEqual((report.accepted, report.rejected), (2, 1))
+        self.assertEqual(report.examples[LoadReport.reason_of("Неверный формат номера автомобиля: X")][0][:2],
+                         (2, "2023-01-03,InvalidNumber,8.2"))
+
+    def test_appended_file_parses_only_new_lines(self):
+        """Тестирование дозагрузки дописанных строк"""
+        self.file_handler.load_products(self.temp_file)
+        with open(self.temp_file, 'a', encoding='utf-8') as file:
+            file.write("2023-01-05,Е789ОС45,5.0\n2023-01-06,Е789")
+        with patch.object(CarPassParser, 'parse_line', wraps=CarPassParser().parse_line) as mock_parse:
+            products = self.file_handler.load_products(self.temp_file)
+        # Новая полная строка и незавершённая последняя строка
+        self.assertEqual(mock_parse.call_count, 2)
+        self.assertEqual([p.car_number for p in products], ["А123ВК78", "В456КМ12", "Е789ОС45"])
+        with open(self.temp_file, 'a', encoding='utf-8') as file:
+            file.write("ОС45,5.5\n")
+        self.assertEqual(len(self.file_handler.load_products(self.temp_file)), 4)
+
+    def test_rewritten_file_is_parsed_again(self):
+        """Тестирование полного разбора изменённого файла"""
+        self.file_handler.load_products(self.temp_file)
+        with open(self.temp_file, 'w', encoding='utf-8') as file:
+            file.write("2023-02-02,К234МН177,9.0\n")
+        products = self.file_handler.load_products(self.temp_file)
+        self.assertEqual([p.car_number for p in products], ["К234МН177"])
+
+    def test_same_size_rewrite_is_parsed_again(self):
+        """Тестирование изменения строки без изменения размера файла"""
+        self.file_handler.load_products(self.temp_file)
+        with open(self.temp_file, 'r+', encoding='utf-8') as file:
+            file.seek(len("2023-01-02,А123ВК78,".encode('utf-8')))
+            file.write("9")
+        os.utime(self.temp_file, ns=(0, os.stat(self.temp_file).st_mtime_ns + 1))
+        products = self.file_handler.load_products(self.temp_file)
+        self.assertEqual(products[0].fuel_consumption, 9.5)
+
+    def test_cache_is_stored_next_to_file(self):
+        """Тестирование размещения кэша рядом с файлом реестра и проверки версии"""
+        cache = ParsedResultCache(self.cache_dir)
+        cache.load_products(self.temp_file, CarPassParser(), LoadReport())
+        self.assertTrue(os.path.exists(ParsedResultCache.side_filename(self.temp_file)))
+        with patch.object(ParsedResultCache, 'version', ParsedResultCache.version + 1):
+            self.assertIsNone(cache._read_entry(self.temp_file))
+
+    def test_least_recently_used_files_are_evicted(self):
+        """Тестирование удаления давно не использованных файлов кэша при превышении размера"""
+        filenames = [self.temp_file + suffix for suffix in (".a", ".b", ".c")]
+        for filename in filenames:
+            shutil.copyfile(self.temp_file, filename)
+            self.addCleanup(os.remove, filename)
+        cache = ParsedResultCache(self.cache_dir)
+        cache.load_products(filenames[0], CarPassParser(), LoadReport())
+        cache.max_bytes = 2 * os.path.getsize(ParsedResultCache.side_filename(filenames[0]))
+        cache.load_products(filenames[1], CarPassParser(), LoadReport())
+        cache.load_products(filenames[0], CarPassParser(), LoadReport())
+        cache.load_products(filenames[2], CarPassParser(), LoadReport())
+        self.assertEqual([os.path.exists(ParsedResultCache.side_filename(name)) for name in filenames],
+                         [True, False, True])
+        for filename in (filenames[0], filenames[2]):
+            os.remove(ParsedResultCache.side_filename(filename))
+
+    def test_foreign_cache_file_is_not_executed(self):
+        """Тестирование того, что подложенный файл pickle не исполняется и не используется"""
+        with open(ParsedResultCache.side_filename(self.temp_file), 'wb') as file:
+            file.write(pickle.dumps(Marker("temp_cache_marker.txt")))
+        products = self.file_handler.load_products(self.temp_file)
+        self.assertFalse(os.path.exists("temp_cache_marker.txt"))
+        self.assertEqual([p.car_number for p in products], ["А123ВК78", "В456КМ12"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import datetime
+import os
+import shutil
+from unittest.mock import MagicMock, patch
+from CarPass import CarPass
+from PartitionedStorage import PartitionedStorage
+from main import ProductFileHandler
+
+class TestPartitionedStorage(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_dir = "temp_partitions"
+        self.temp_file = "temp_flat_file.txt"
+        self.logger = MagicMock()
+        with open(self.temp_file, 'w', encoding='utf-8') as file:
+            file.write("2023-01-02,А123ВК78,7.5\n2023-01-20,В456КМ12,8.2\n2023-02-03,Е789ОС45,6.8\n"
+                       "2023-02-04,InvalidNumber,6.8\n2023-03-15,А123ВК78,7.0\n")
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        os.remove(self.temp_file)
+
+    def test_migrate_builds_manifest(self):
+        """Тестирование переноса обычного файла в хранилище"""
+        storage = PartitionedStorage.migrate(self.temp_file, self.temp_dir, "month", self.logger, buffer_size=2)
+        self.assertEqual(sorted(storage.partitions), ["2023-01", "2023-02", "2023-03"])
+        self.assertEqual(storage.partitions["2023-01"]["rows"], 2)
+        self.assertEqual(storage.partitions["2023-01"]["min_date"], "2023-01-02")
+        self.assertEqual(storage.partitions["2023-01"]["max_date"], "2023-01-20")
+        self.logger.log_message.assert_called_once_with("ОШИБКА", unittest.mock.ANY)
+        reopened = PartitionedStorage(self.temp_dir)
+        self.assertEqual(reopened.granularity, "month")
+        self.assertEqual(len(reopened.load_products()), 4)
+        with self.assertRaises(ValueError):
+            PartitionedStorage(self.temp_dir, "day")
+
+    def test_repeated_migrate_adds_only_new_lines(self):
+        """Тестирование повторного переноса неизменённого и дописанного файла"""
+        PartitionedStorage.migrate(self.temp_file, self.temp_dir, "month")
+        storage = PartitionedStorage.migrate(self.temp_file, self.temp_dir)
+        self.assertEqual(len(storage.load_products()), 4)
+        with open(self.temp_file, 'a', encoding='utf-8') as file:
+            file.write("2023-03-16,В456КМ12,8.0\n")
+        storage = PartitionedStorage.migrate(self.temp_file, self.temp_dir)
+        self.assertEqual(storage.partitions["2023-03"]["rows"], 2)
+        self.assertEqual(len(PartitionedStorage(self.temp_dir).load_products()), 5)
+
+    def test_partial_last_line_waits_for_newline(self):
+        """Тестирование переноса строки, которую дописали после предыдущего переноса"""
+        with open(self.temp_file, 'a', encoding='utf-8') as file:
+            file.write("2023-03-16,В456")
+        storage = PartitionedStorage.migrate(self.temp_file, self.temp_dir, "month")
+        self.assertEqual(len(storage.load_products()), 4)
+        with open(self.temp_file, 'a', encoding='utf-8') as file:
+            file.write("КМ12,8.0\n")
+        storage = PartitionedStorage.migrate(self.temp_file, self.temp_dir)
+        self.assertEqual([p.car_number for p in storage.load_products()][-1], "В456КМ12")
+        self.assertEqual(len(storage.load_products()), 5)
+
+    def test_reading_does_not_create_directory(self):
+        """Тестирование открытия несуществующего хранилища без создания каталога"""
+        storage = PartitionedStorage(self.temp_dir)
+        self.assertEqual(storage.load_products(), [])
+        self.assertFalse(os.path.exists(self.temp_dir))
+
+    def test_range_query_opens_only_overlapping_partitions(self):
+        """Тестирование отсечения секций по периоду"""
+        PartitionedStorage.migrate(self.temp_file, self.temp_dir, "day")
+        storage = PartitionedStorage(self.temp_dir)
+        start, end = datetime.date(2023, 1, 15), datetime.date(2023, 2, 3)
+        self.assertEqual(storage.partitions_for(start, end), ["2023-01-20", "2023-02-03"])
+        with patch("builtins.open", wraps=open) as mock_open:
+            products = storage.load_products(start, end)
+        self.assertEqual(mock_open.call_count, 2)
+        self.assertEqual([p.car_number for p in products], ["В456КМ12", "Е789ОС45"])
+
+    def test_append_and_file_handler_range(self):
+        """Тестирование дозаписи и загрузки за период через ProductFileHandler"""
+        storage = PartitionedStorage(self.temp_dir, "month")
+        storage.append_products([CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", 7.5),
+                                 CarPass(datetime.datetime(2023, 2, 5), "В456КМ12", 8.2)])
+        storage.append_products([CarPass(datetime.datetime(2023, 1, 1), "Е789ОС45", 6.8)])
+        self.assertEqual(storage.partitions["2023-01"]["min_date"], "2023-01-01")
+        file_handler = ProductFileHandler(self.logger)
+        self.assertEqual(len(file_handler.load_products(self.temp_dir)), 3)
+        hook = MagicMock()
+        file_handler.add_record_hook(hook)
+        products = file_handler.load_products_range(self.temp_dir, datetime.date(2023, 1, 1), datetime.date(2023, 1, 31))
+        self.assertEqual(sorted(p.car_number for p in products), ["А123ВК78", "Е789ОС45"])
+        self.assertEqual(hook.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
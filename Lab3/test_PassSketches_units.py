@@ -0,0 +1,119 @@
+import unittest
+import datetime
+import math
+import os
+import random
+from collections import Counter
+from unittest.mock import MagicMock
+from CarPass import CarPass
+from PassSketches import PassSketches, HyperLogLog
+from main import ProductFileHandler
+
+LETTERS = "АВЕКМНОРСТУХ"
+
+def random_plate(rng: random.Random) -> str:
+    return (rng.choice(LETTERS) + f"{rng.randint(0, 999):03d}" + rng.choice(LETTERS)
+            + rng.choice(LETTERS) + f"{rng.randint(1, 99):02d}")
+
+class TestPassSketches(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения: проезды с частыми номерами"""
+        rng = random.Random(3)
+        self.frequent = [random_plate(rng) for _ in range(10)]
+        self.products = []
+        for day in range(3):
+            date = datetime.datetime(2023, 3, 1 + day)
+            for _ in range(20000):
+                if rng.random() < 0.2:
+                    # Частые номера с разной частотой: первый чаще всех
+                    plate = self.frequent[min(int(rng.expovariate(0.3)), 9)]
+                else:
+                    plate = random_plate(rng)
+                self.products.append(CarPass(date, plate, 7.5))
+        self.temp_file = "temp_sketch_file.txt"
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        for filename in (self.temp_file, PassSketches.side_filename(self.temp_file),
+                         self.temp_file + ".rollup"):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def test_distinct_counts_within_error(self):
+        """Тестирование оценки числа различных номеров за день и за период"""
+        sketches = PassSketches()
+        for product in self.products:
+            sketches.add(product)
+        bound = 3 * 1.04 / math.sqrt(1 << sketches.precision)
+        for day in ("2023-03-01", "2023-03-02", "2023-03-03"):
+            exact = len({p.car_number for p in self.products if p.pass_date.date().isoformat() == day})
+            self.assertLess(abs(sketches.distinct_cars(day) - exact) / exact, bound)
+        exact = len({p.car_number for p in self.products})
+        self.assertLess(abs(sketches.distinct_cars_between("2023-03-01", "2023-03-03") - exact) / exact, bound)
+        self.assertEqual(sketches.distinct_cars("2023-03-04"), 0)
+
+    def test_small_set_is_exact(self):
+        """Тестирование оценки малого множества"""
+        sketch = HyperLogLog()
+        for plate in ("А123ВК78", "В456КМ12", "А123ВК78"):
+            sketch.add(plate)
+        self.assertEqual(sketch.count(), 2)
+
+    def test_heavy_hitters_match_exact(self):
+        """Тестирование оценок числа проездов и самых частых номеров"""
+        sketches = PassSketches(top_k=10)
+        for product in self.products:
+            sketches.add(product)
+        exact = Counter(p.car_number for p in self.products)
+        error = math.e / sketches.counts.width * len(self.products)
+        for plate in self.frequent:
+            self.assertGreaterEqual(sketches.passes(plate), exact[plate])
+            self.assertLessEqual(sketches.passes(plate), exact[plate] + error)
+        top = [plate for plate, _ in sketches.heavy_hitters(5)]
+        self.assertEqual(top, [plate for plate, _ in exact.most_common(5)])
+
+    def test_merge_equals_single_pass(self):
+        """Тестирование объединения сводок по частям реестра"""
+        whole, first, second = PassSketches(), PassSketches(), PassSketches()
+        for i, product in enumerate(self.products):
+            whole.add(product)
+            (first if i % 2 else second).add(product)
+        first.merge(second)
+        self.assertEqual(first.daily["2023-03-02"].registers, whole.daily["2023-03-02"].registers)
+        self.assertEqual(first.counts.counters, whole.counts.counters)
+        self.assertEqual([plate for plate, _ in first.heavy_hitters(5)],
+                         [plate for plate, _ in whole.heavy_hitters(5)])
+
+    def test_merge_misses_only_plates_within_bound(self):
+        """Тестирование границы ошибки объединения списков самых частых номеров"""
+        date = datetime.datetime(2023, 3, 1)
+        first, second = PassSketches(top_k=2), PassSketches(top_k=2)
+        # Номер Х000ХХ00 третий в каждой части, но первый в сумме
+        for sketches, counts in ((first, {"А001АА01": 10, "В002ВВ02": 9}),
+                                 (second, {"Е003ЕЕ03": 10, "К004КК04": 9})):
+            counts["Х000ХХ00"] = 8
+            for plate, count in counts.items():
+                for _ in range(count):
+                    sketches.add(CarPass(date, plate, 7.5))
+        bound = min(first.top.values()) + min(second.top.values())
+        first.merge(second)
+        self.assertNotIn("Х000ХХ00", first.top)
+        self.assertLessEqual(16, bound)
+
+    def test_save_load_and_hook(self):
+        """Тестирование построения сводок при загрузке и их сохранения рядом с реестром"""
+        file_handler = ProductFileHandler(MagicMock())
+        file_handler.save_products(self.products[:1000], self.temp_file)
+        sketches = PassSketches()
+        file_handler.add_record_hook(sketches.add)
+        file_handler.load_products(self.temp_file)
+        sketches.save(self.temp_file)
+        loaded = PassSketches.load(self.temp_file)
+        self.assertEqual(loaded.to_dict(), sketches.to_dict())
+        self.assertEqual(PassSketches.from_file(self.temp_file).to_dict(), sketches.to_dict())
+        with open(self.temp_file, 'a', encoding='utf-8') as file:
+            file.write("2023-03-05,А123ВК78,7.5\n")
+        self.assertIsNone(PassSketches.load(self.temp_file))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import datetime
+import random
+from CarPass import CarPass
+from PlateIndex import PlateIndex, levenshtein
+from main import ProductManager
+
+LETTERS = "АВЕКМНОРСТУХ"
+
+class TestPlateIndex(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        rng = random.Random(7)
+        self.plates = {rng.choice(LETTERS) + f"{rng.randint(0, 99):03d}" + rng.choice(LETTERS[:3])
+                       + rng.choice(LETTERS[:3]) + f"{rng.randint(1, 3):02d}" for _ in range(1000)}
+        self.index = PlateIndex(max_distance=2)
+        for plate in self.plates:
+            self.index.add(plate)
+
+    def test_levenshtein(self):
+        """Тестирование расстояния Левенштейна"""
+        self.assertEqual(levenshtein("А123ВЕ77", "А123ВЕ77", 2), 0)
+        self.assertEqual(levenshtein("А123ВЕ77", "А128ВЕ77", 2), 1)
+        self.assertEqual(levenshtein("А123ВЕ77", "А123ВЕ777", 2), 1)
+        self.assertEqual(levenshtein("А123ВЕ77", "123ВЕ7", 2), 2)
+        self.assertEqual(levenshtein("А123ВЕ77", "Х999ОО01", 2), 3)
+
+    def test_search_matches_brute_force(self):
+        """Тестирование совпадения результатов индекса с полным перебором"""
+        rng = random.Random(11)
+        queries = [rng.choice(sorted(self.plates)) for _ in range(50)]
+        queries = [query[:i] + rng.choice("0123456789АВЕ") + query[i + 1:] for i, query in enumerate(queries[:25], 1)] + queries[25:]
+        queries += ["А012АВ01"[:7], "А012АВ011"]
+        for k in (0, 1, 2):
+            for query in queries:
+                expected = sorted((plate, levenshtein(query, plate, k)) for plate in self.plates
+                                  if levenshtein(query, plate, k) <= k)
+                self.assertEqual(sorted(self.index.search(query, k)), expected, (query, k))
+
+    def test_discard_and_limit(self):
+        """Тестирование удаления номера и ограничения числа результатов"""
+        index = PlateIndex(max_distance=1)
+        index.add("А123ВЕ77")
+        index.add("А123ВЕ77")
+        index.add("А124ВЕ77")
+        self.assertEqual(index.search("А123ВЕ77", 1, limit=1), [("А123ВЕ77", 0)])
+        index.discard("А123ВЕ77")
+        self.assertIn("А123ВЕ77", index)
+        index.discard("А123ВЕ77")
+        self.assertEqual(index.search("А123ВЕ77", 1), [("А124ВЕ77", 1)])
+        with self.assertRaises(ValueError):
+            index.search("А123ВЕ77", 2)
+
+    def test_manager_search(self):
+        """Тестирование поиска по реестру"""
+        manager = ProductManager()
+        manager.replace_products([CarPass(datetime.datetime(2023, 1, 2), "А123ВЕ77", 7.5),
+                                  CarPass(datetime.datetime(2023, 1, 3), "В456КМ12", 8.2)])
+        self.assertEqual(manager.search_plates("А123ВЕ71"), [("А123ВЕ77", 1)])
+        manager.add_product(CarPass(datetime.datetime(2023, 1, 4), "А123ВЕ71", 6.0))
+        self.assertEqual(manager.search_plates("А123ВЕ71"), [("А123ВЕ71", 0), ("А123ВЕ77", 1)])
+        manager.delete_product(2)
+        self.assertEqual(manager.search_plates("А123ВЕ71"), [("А123ВЕ77", 1)])
+
+    def test_manager_builds_index_in_background(self):
+        """Тестирование построения индекса в фоне с учётом изменений за время построения"""
+        manager = ProductManager()
+        manager.replace_products([CarPass(datetime.datetime(2023, 1, 2), "А123ВЕ77", 7.5),
+                                  CarPass(datetime.datetime(2023, 1, 3), "В456КМ12", 8.2)])
+        manager.start_plate_index()
+        manager.add_product(CarPass(datetime.datetime(2023, 1, 4), "А123ВЕ71", 6.0))
+        manager.delete_product(0)
+        self.assertEqual(manager.search_plates("А123ВЕ71"), [("А123ВЕ71", 0)])
+        self.assertEqual(manager.plate_index.max_distance, 1)
+
+if __name__ == '__main__':
+    unittest.main()
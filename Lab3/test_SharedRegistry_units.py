@@ -0,0 +1,93 @@
+import unittest
+import datetime
+import multiprocessing
+import os
+import random
+from CarPass import CarPass
+from SharedRegistry import SharedRegistry
+
+READERS = 3
+RECORDS = 200000
+
+def rss_anon_kb() -> int:
+    """Размер анонимной (неразделяемой) памяти процесса, КБ"""
+    with open("/proc/self/status", encoding='utf-8') as file:
+        for line in file:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1])
+    return 0
+
+def summarize(registry) -> tuple:
+    """Итоги по реестру: число записей, суммарный расход, проезды первого номера и выборка записей"""
+    first_plate = registry[0].car_number
+    passes = sum(1 for product in registry if product.car_number == first_plate)
+    total_fuel = round(sum(product.fuel_consumption for product in registry), 3)
+    sample = [str(registry[index]) for index in range(0, len(registry), len(registry) // 10)]
+    return len(registry), total_fuel, passes, sample
+
+def read_registry(name: str, results) -> None:
+    """Процесс-читатель: подключение к реестру и подсчёт итогов"""
+    before = rss_anon_kb()
+    registry = SharedRegistry.attach(name)
+    summary = summarize(registry)
+    growth = rss_anon_kb() - before
+    registry.close()
+    results.put((summary, growth))
+
+class TestSharedRegistry(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        rng = random.Random(5)
+        start = datetime.datetime(2023, 1, 1)
+        plates = [f"А{number:03d}ВК{region}" for number in range(1000) for region in (12, 78)]
+        self.products = [CarPass(start + datetime.timedelta(days=rng.randint(0, 364)), rng.choice(plates),
+                                 round(rng.uniform(3.0, 20.0), 1)) for _ in range(RECORDS)]
+
+    def test_attach_and_read(self):
+        """Тестирование подключения к реестру в том же процессе"""
+        with SharedRegistry.publish(self.products[:100]) as registry:
+            reader = SharedRegistry.attach(registry.name)
+            self.assertEqual(len(reader), 100)
+            self.assertEqual([str(p) for p in reader], [str(p) for p in self.products[:100]])
+            self.assertEqual(str(reader[-1]), str(self.products[99]))
+            self.assertEqual(sum(reader.fuel), sum(p.fuel_consumption for p in self.products[:100]))
+            with self.assertRaises(IndexError):
+                reader[100]
+            self.assertTrue(reader.fuel.readonly)
+            reader.close()
+        # При нечётном числе записей выравнивание не попадает в столбцы
+        with SharedRegistry.publish(self.products[:3]) as registry:
+            reader = SharedRegistry.attach(registry.name)
+            self.assertEqual((len(reader.ordinals), len(reader.plate_ids), len(reader.fuel)), (3, 3, 3))
+            self.assertEqual(list(reader.ordinals), [p.pass_date.toordinal() for p in self.products[:3]])
+            with self.assertRaises(TypeError):
+                reader.fuel[0] = 0.0
+            reader.close()
+
+    def test_empty_registry(self):
+        """Тестирование публикации пустого реестра"""
+        with SharedRegistry.publish([]) as registry, SharedRegistry.attach(registry.name) as reader:
+            self.assertEqual(list(reader), [])
+
+    @unittest.skipUnless(os.path.exists("/proc/self/status"), "нужна файловая система /proc")
+    def test_spawned_readers_share_memory(self):
+        """Тестирование читателей в отдельных процессах: совпадение итогов и отсутствие копии реестра"""
+        expected = summarize(self.products)
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        with SharedRegistry.publish(self.products) as registry:
+            readers = [context.Process(target=read_registry, args=(registry.name, results))
+                       for _ in range(READERS)]
+            for reader in readers:
+                reader.start()
+            outcomes = [results.get(timeout=120) for _ in readers]
+            for reader in readers:
+                reader.join()
+                self.assertEqual(reader.exitcode, 0)
+        for summary, growth in outcomes:
+            self.assertEqual(summary, expected)
+            # Собственная копия 200 000 записей заняла бы десятки мегабайт
+            self.assertLess(growth, 8 * 1024)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import datetime
+import os
+from unittest.mock import MagicMock
+from CarPassParser import CarPassParser
+from SupplyFileFollower import SupplyFileFollower
+
+class TestSupplyFileFollower(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_file = "temp_follow_file.txt"
+        self.logger = MagicMock()
+        self.write("2023-01-02,А123ВК78,7.5\n")
+        self.follower = SupplyFileFollower(self.temp_file, CarPassParser(), self.logger)
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        self.follower.close()
+        for filename in (self.temp_file, self.temp_file + ".1"):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def write(self, text: str, mode: str = 'a') -> None:
+        with open(self.temp_file, mode, encoding='utf-8') as file:
+            file.write(text)
+
+    def test_reads_only_new_lines(self):
+        """Тестирование чтения только дописанных строк"""
+        self.assertEqual(len(self.follower.poll()), 1)
+        self.assertEqual(self.follower.poll(), [])
+        self.write("2023-01-03,В456КМ12,8.2\n")
+        products = self.follower.poll()
+        self.assertEqual([p.car_number for p in products], ["В456КМ12"])
+
+    def test_partial_line_waits_for_newline(self):
+        """Тестирование отложенного чтения неполной строки"""
+        self.follower.poll()
+        self.write("2023-01-03,В456")
+        self.assertEqual(self.follower.poll(), [])
+        self.write("КМ12,8.2\n")
+        self.assertEqual([p.car_number for p in self.follower.poll()], ["В456КМ12"])
+
+    def test_truncation(self):
+        """Тестирование обрезки файла"""
+        self.follower.poll()
+        self.write("", mode='w')
+        self.assertEqual(self.follower.poll(), [])
+        self.write("2023-01-04,Е789ОС45,6.8\n")
+        self.assertEqual([p.car_number for p in self.follower.poll()], ["Е789ОС45"])
+
+    def test_rotation(self):
+        """Тестирование ротации файла с дочитыванием старого"""
+        self.follower.poll()
+        self.write("2023-01-03,В456КМ12,8.2\n")
+        os.rename(self.temp_file, self.temp_file + ".1")
+        self.write("2023-01-04,Е789ОС45,6.8\n", mode='w')
+        products = self.follower.poll()
+        self.assertEqual([p.car_number for p in products], ["В456КМ12", "Е789ОС45"])
+
+    def test_invalid_line_is_logged(self):
+        """Тестирование записи в лог ошибочной строки"""
+        self.follower.poll()
+        self.write("2023-01-03,InvalidNumber,8.2\n")
+        self.assertEqual(self.follower.poll(), [])
+        self.logger.log_message.assert_called_once_with("ОШИБКА", unittest.mock.ANY)
+
+    def test_passes_after_midnight_are_accepted(self):
+        """Тестирование проездов, добавленных после смены даты"""
+        self.follower.poll()
+        self.follower.parser.current_date = datetime.datetime.now() - datetime.timedelta(days=1)
+        self.write(f"{datetime.date.today():%Y-%m-%d},В456КМ12,8.2\n")
+        self.assertEqual([p.car_number for p in self.follower.poll()], ["В456КМ12"])
+        self.logger.log_message.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
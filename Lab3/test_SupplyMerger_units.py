@@ -0,0 +1,90 @@
+import unittest
+import datetime
+import gzip
+import os
+import random
+import shutil
+from unittest.mock import MagicMock
+from CarPass import CarPass
+from LoadReport import LoadReport, ErrorBudgetExceeded
+from SupplyMerger import SupplyMerger, merge_files
+from main import ProductManager, ProductFileHandler
+
+class TestSupplyMerger(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения: упорядоченные по дате файлы пунктов пропуска"""
+        self.temp_dir = "temp_merge_files"
+        os.makedirs(self.temp_dir, exist_ok=True)
+        rng = random.Random(7)
+        start = datetime.datetime(2023, 1, 1)
+        self.filenames = []
+        self.expected = []
+        for i in range(12):
+            dates = sorted(start + datetime.timedelta(days=rng.randint(0, 300)) for _ in range(rng.randint(0, 400)))
+            products = [CarPass(date, f"А{i:03d}ВК78", float(n + 1)) for n, date in enumerate(dates)]
+            filename = os.path.join(self.temp_dir, f"checkpoint_{i}.txt")
+            with open(filename, 'w', encoding='utf-8') as file:
+                file.writelines(str(product) + "\n" for product in products)
+            self.filenames.append(filename)
+            self.expected.extend(products)
+        # Сортировка устойчива, поэтому при равных датах сохраняется порядок файлов
+        self.expected.sort(key=lambda product: product.pass_date)
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_merge_matches_sort(self):
+        """Тестирование совпадения слияния с сортировкой всех записей при малом пуле"""
+        merged = list(SupplyMerger(self.filenames, workers=2, batch_size=16))
+        self.assertEqual([str(p) for p in merged], [str(p) for p in self.expected])
+
+    def test_merge_into_manager(self):
+        """Тестирование слияния в менеджер записей"""
+        manager = ProductManager()
+        count = SupplyMerger(self.filenames).merge_into(manager)
+        self.assertEqual(count, len(self.expected))
+        self.assertEqual(manager.count_products(), len(self.expected))
+        self.assertEqual(manager.get_product(0).pass_date, self.expected[0].pass_date)
+
+    def test_merge_to_file(self):
+        """Тестирование слияния в сжатый выходной файл"""
+        with open(self.filenames[0], 'rb') as source, gzip.open(self.filenames[0] + ".gz", 'wb') as target:
+            shutil.copyfileobj(source, target)
+        output = os.path.join(self.temp_dir, "registry.txt")
+        report = merge_files([self.filenames[0] + ".gz"] + self.filenames[1:], output)
+        self.assertEqual(report.accepted, len(self.expected))
+        products = ProductFileHandler(MagicMock()).load_products(output)
+        self.assertEqual([str(p) for p in products], [str(p) for p in self.expected])
+
+    def test_output_cannot_be_input(self):
+        """Тестирование запрета записи слияния в один из входных файлов"""
+        with open(self.filenames[1], encoding='utf-8') as file:
+            content = file.read()
+        with self.assertRaises(ValueError):
+            merge_files(self.filenames, os.path.join(self.temp_dir, ".", "checkpoint_1.txt"))
+        with open(self.filenames[1], encoding='utf-8') as file:
+            self.assertEqual(file.read(), content)
+
+    def test_bad_and_unordered_lines_are_reported(self):
+        """Тестирование отклонения ошибочных строк и строк, нарушающих порядок дат"""
+        filename = os.path.join(self.temp_dir, "broken.txt")
+        with open(filename, 'w', encoding='utf-8') as file:
+            file.write("2023-01-05,Е789ОС45,5.0\n2023-01-03,Е789ОС45,5.0\nInvalid\n2023-01-06,Е789ОС45,5.0\n")
+        report = LoadReport()
+        merged = list(SupplyMerger([filename], report=report))
+        self.assertEqual([p.pass_date.day for p in merged], [5, 6])
+        self.assertEqual(report.rejected, 2)
+        self.assertIn("Нарушен порядок дат", report.reasons)
+        with self.assertRaises(ErrorBudgetExceeded):
+            list(SupplyMerger([filename], report=LoadReport(error_budget=1)))
+
+    def test_stopped_merge_closes_files(self):
+        """Тестирование прерывания слияния до конца файлов"""
+        merger = iter(SupplyMerger(self.filenames, workers=2, batch_size=4))
+        first = [next(merger) for _ in range(10)]
+        merger.close()
+        self.assertEqual(first, sorted(first, key=lambda product: product.pass_date))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import datetime
+import os
+from unittest.mock import MagicMock
+from CarPass import CarPass
+from Watchlist import Watchlist
+from main import ProductFileHandler, ProductManager
+
+class TestWatchlist(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.watchlist = Watchlist()
+        for entry in ("А123ВК78", "А***КВ78", "*456КМ12*", "a1**bk78"):
+            self.watchlist.add(entry)
+
+    def test_exact_and_wildcard_matches(self):
+        """Тестирование точных номеров и шаблонов"""
+        self.assertEqual(len(self.watchlist), 4)
+        self.assertEqual(self.watchlist.match("А123ВК78"), ["А123ВК78", "А1**ВК78"])
+        self.assertEqual(self.watchlist.match("А999КВ78"), ["А***КВ78"])
+        self.assertEqual(self.watchlist.match("В456КМ125"), ["*456КМ12*"])
+        self.assertEqual(self.watchlist.match("В456КМ12"), [])
+        self.assertEqual(self.watchlist.match("Е789ОС45"), [])
+
+    def test_callback_on_match(self):
+        """Тестирование уведомления о совпадении"""
+        on_match = MagicMock()
+        watchlist = Watchlist(on_match=on_match)
+        watchlist.add("А***КВ78")
+        product = CarPass(datetime.datetime(2023, 1, 2), "А555КВ78", 7.5)
+        self.assertTrue(watchlist.check(product))
+        self.assertFalse(watchlist.check(CarPass(datetime.datetime(2023, 1, 2), "В555КВ78", 7.5)))
+        on_match.assert_called_once_with(product, ["А***КВ78"])
+
+    def test_hooks_in_loading_and_add_product(self):
+        """Тестирование проверки при загрузке файла и добавлении записи"""
+        temp_file = "temp_watchlist_file.txt"
+        with open(temp_file, 'w', encoding='utf-8') as file:
+            file.write("2023-01-02,А123ВК78,7.5\n2023-01-03,Е789ОС45,8.2\n")
+        self.addCleanup(os.remove, temp_file)
+        logger = MagicMock()
+        watchlist = Watchlist(logger)
+        watchlist.add("А123ВК78")
+        file_handler = ProductFileHandler(MagicMock())
+        file_handler.add_record_hook(watchlist.check)
+        manager = ProductManager()
+        manager.add_record_hook(watchlist.check)
+        file_handler.load_products(temp_file)
+        logger.log_message.assert_called_once_with("РОЗЫСК", unittest.mock.ANY)
+        manager.add_product(CarPass(datetime.datetime(2023, 1, 4), "А123ВК78", 6.0))
+        self.assertEqual(logger.log_message.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,13 @@ import unittest
 import sys
 import os
 import datetime
+import gzip
 from unittest.mock import patch, MagicMock
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtCore import QDate, Qt
 from CarPass import CarPass
 from CarPassBase import CarPassBase
+from PassRollups import PassRollups
 from main import (
     ProductManager,
     ProductTableModel,
@@ -50,6 +52,15 @@ class TestProductManager(unittest.TestCase):
         self.manager.clear_products()
         self.assertEqual(len(self.manager.car_passes), 0)
 
+    def test_rollups_follow_changes(self):
+        """Тестирование обновления агрегатов при добавлении и удалении записей"""
+        product = CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", 7.5)
+        self.manager.add_product(product)
+        self.manager.add_product(product)
+        self.manager.delete_product(0)
+        self.assertEqual(self.manager.rollups.daily_passes("2023-01-02"), 1)
+        self.assertEqual(self.manager.rollups.monthly_report("2023-01"), {"А123ВК78": (1, 7.5)})
+
     def test_get_products(self):
         """Тестирование получения копии списка записей"""
         self.manager.add_product(self.sample_car_pass)
@@ -86,6 +97,16 @@ class TestProductTableModel(unittest.TestCase):
         index = self.model.index(0, 0)
         self.assertEqual(self.model.data(index), datetime.datetime.now().date().strftime("%Y-%m-%d"))
 
+    def test_append_products(self):
+        """Тестирование добавления строк с уведомлением о вставке"""
+        inserted = []
+        self.model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        self.manager.add_product(self.sample_car_pass)
+        self.model.append_products([self.sample_car_pass, self.sample_car_pass])
+        self.model.append_products([])
+        self.assertEqual(inserted, [(1, 2)])
+        self.assertEqual(self.model.rowCount(), 3)
+
     def test_header_data(self):
         """Тестирование заголовков таблицы"""
         self.assertEqual(self.model.headerData(0, Qt.Orientation.Horizontal), "Дата проезда")
@@ -119,8 +140,9 @@ class TestProductFileHandler(unittest.TestCase):
 
     def tearDown(self):
         """Очистка после тестов"""
-        if os.path.exists(self.temp_file):
-            os.remove(self.temp_file)
+        for filename in (self.temp_file, PassRollups.side_filename(self.temp_file)):
+            if os.path.exists(filename):
+                os.remove(filename)
 
     def test_save_and_load_products(self):
         """Тестирование сохранения и загрузки записей"""
@@ -180,6 +202,142 @@ class TestProductFileHandler(unittest.TestCase):
             unittest.mock.ANY
         )
 
+    def test_save_and_load_compressed(self):
+        """Тестирование сохранения и загрузки сжатых файлов"""
+        product = CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", 7.5)
+        file_handler = ProductFileHandler(self.logger)
+        for extension in (".gz", ".bz2", ".xz"):
+            filename = self.temp_file + extension
+            self.addCleanup(os.remove, filename)
+            self.addCleanup(os.remove, PassRollups.side_filename(filename))
+            file_handler.save_products([product], filename)
+            with open(filename, 'rb') as file:
+                self.assertFalse(file.read().startswith(b"2023-01-02"))
+            loaded_products = file_handler.load_products(filename)
+            self.assertEqual(len(loaded_products), 1)
+            self.assertEqual(loaded_products[0].car_number, "А123ВК78")
+
+    def test_load_compressed_by_magic_bytes(self):
+        """Тестирование определения сжатия по сигнатуре файла без расширения"""
+        with gzip.open(self.temp_file, 'wt', encoding='utf-8') as file:
+            file.write("2023-01-02,А123ВК78,7.5\n")
+        loaded_products = ProductFileHandler(self.logger).load_products(self.temp_file)
+        self.assertEqual(len(loaded_products), 1)
+        self.logger.log_message.assert_not_called()
+
+    def test_load_normalizes_car_numbers(self):
+        """Тестирование приведения латинских и строчных букв номера к кириллице"""
+        with open(self.temp_file, 'w', encoding='utf-8') as file:
+            file.write("2023-01-02,A123BK78,7.5\n2023-01-03,а123вк78,8.0\n2023-01-04,А123ВК78,6.0\n")
+        loaded_products = ProductFileHandler(self.logger).load_products(self.temp_file)
+        self.logger.log_message.assert_not_called()
+        self.assertEqual([p.car_number for p in loaded_products], ["А123ВК78"] * 3)
+        self.assertIs(loaded_products[0].car_number, loaded_products[2].car_number)
+
+    def test_save_writes_rollups(self):
+        """Тестирование сохранения агрегатов рядом с реестром"""
+        file_handler = ProductFileHandler(self.logger)
+        products = [CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", 7.5),
+                    CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", 8.5),
+                    CarPass(datetime.datetime(2023, 2, 3), "В456КМ12", 6.0)]
+        file_handler.save_products(products, self.temp_file)
+        file_handler.append_products([CarPass(datetime.datetime(2023, 1, 5), "В456КМ12", 5.0)], self.temp_file)
+        rollups = PassRollups.load(self.temp_file)
+        self.assertEqual(rollups.daily_passes("2023-01-02"), 2)
+        self.assertEqual(rollups.monthly_report("2023-01"), {"А123ВК78": (2, 16.0), "В456КМ12": (1, 5.0)})
+        self.logger.log_message.assert_not_called()
+
+    def test_load_rollups_rebuilds_corrupted_file(self):
+        """Тестирование перестроения агрегатов при несовпадении контрольной суммы"""
+        file_handler = ProductFileHandler(self.logger)
+        file_handler.save_products([CarPass(datetime.datetime(2023, 1, 2), "А123ВК78", 7.5)], self.temp_file)
+        with open(PassRollups.side_filename(self.temp_file), 'a', encoding='utf-8') as file:
+            file.write(" ")
+        self.assertIsNone(PassRollups.load(self.temp_file))
+        rollups = file_handler.load_rollups(self.temp_file)
+        self.assertEqual(rollups.monthly_report("2023-01"), {"А123ВК78": (1, 7.5)})
+        self.assertIsNotNone(PassRollups.load(self.temp_file))
+
+    @patch('main.open_text_file', side_effect=PermissionError("Нет доступа"))
+    def test_failed_save_keeps_original_error(self, mock_open):
+        """Тестирование ошибки создания временного файла: исходная ошибка не подменяется"""
+        with self.assertRaises(PermissionError):
+            ProductFileHandler(self.logger).save_products([self.sample_car_pass], self.temp_file)
+        self.assertFalse(os.path.exists(self.temp_file))
+
+class TestLazyLoading(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_file = "temp_lazy_file.txt"
+        self.logger = MagicMock()
+        with open(self.temp_file, 'w', encoding='utf-8') as file:
+            file.write("2023-01-02,А123ВК78,7.5\n\n2023-01-03,И123БВ78,7.5\n2023-01-04,В456КМ12,8.2\n")
+        self.products = ProductFileHandler(self.logger).load_products_lazy(self.temp_file, cache_size=1)
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        self.products.validation_finished.wait(5)
+        self.products.close()
+        os.remove(self.temp_file)
+
+    def test_rows_are_parsed_on_access(self):
+        """Тестирование разбора строк при обращении и исключения невалидных строк"""
+        self.products.validation_finished.wait(5)
+        self.assertEqual(len(self.products), 2)
+        self.assertEqual(self.products[0].car_number, "А123ВК78")
+        self.assertEqual(self.products[1].car_number, "В456КМ12")
+        self.assertEqual(self.products[-1].fuel_consumption, 8.2)
+        self.assertEqual(self.products[0].car_number, "А123ВК78")
+
+    def test_background_validation_logs_errors_once(self):
+        """Тестирование фоновой проверки строк"""
+        self.products.validation_finished.wait(5)
+        self.products.copy()
+        self.logger.log_message.assert_called_once_with("ОШИБКА", unittest.mock.ANY)
+
+    def test_manager_with_lazy_products(self):
+        """Тестирование работы менеджера и модели с ленивым списком"""
+        self.products.validation_finished.wait(5)
+        manager = ProductManager()
+        manager.replace_products(self.products)
+        manager.add_product(CarPass(datetime.datetime(2023, 1, 5), "Е789ОС45", 6.8))
+        manager.delete_product(0)
+        model = ProductTableModel(manager)
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.data(model.index(0, 1)), "В456КМ12")
+        self.assertEqual(model.data(model.index(1, 1)), "Е789ОС45")
+        self.assertEqual([p.car_number for p in manager.get_products()], ["В456КМ12", "Е789ОС45"])
+
+    def test_replaced_lazy_products_are_closed(self):
+        """Тестирование закрытия ленивого списка при замене записей"""
+        manager = ProductManager()
+        manager.replace_products(self.products)
+        manager.replace_products([])
+        self.assertFalse(self.products._thread.is_alive())
+        self.assertTrue(self.products._file.closed)
+
+    def test_lazy_snapshot(self):
+        """Тестирование снимка ленивого списка"""
+        self.products.validation_finished.wait(5)
+        snapshot = self.products.snapshot()
+        self.products.append(CarPass(datetime.datetime(2023, 1, 5), "Е789ОС45", 6.8))
+        del self.products[0]
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(snapshot[0].car_number, "А123ВК78")
+        self.assertEqual(self.products[-1].car_number, "Е789ОС45")
+        with self.assertRaises(TypeError):
+            snapshot.append(None)
+
+    def test_save_lazy_snapshot_to_same_file(self):
+        """Тестирование сохранения снимка ленивого списка в файл, из которого он читается"""
+        self.products.validation_finished.wait(5)
+        handler = ProductFileHandler(self.logger)
+        handler.save_products(self.products.snapshot(), self.temp_file)
+        with open(self.temp_file, encoding='utf-8') as file:
+            self.assertEqual(file.read(), "2023-01-02,А123ВК78,7.5\n2023-01-04,В456КМ12,8.2\n")
+        self.assertEqual([p.car_number for p in self.products.copy()], ["А123ВК78", "В456КМ12"])
+        os.remove(PassRollups.side_filename(self.temp_file))
+
 class TestProductWindow(unittest.TestCase):
     def setUp(self):
         """Подготовка тестового окружения"""
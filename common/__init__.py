@@ -0,0 +1 @@
+"""Общий код лабораторных работ: сжатые файлы реестра и сводка ошибок загрузки"""
@@ -0,0 +1,68 @@
+import bz2
+import gzip
+import lzma
+
+# Сигнатуры сжатых форматов и соответствующие им модули стандартной библиотеки
+COMPRESSION_MAGIC = (
+    (b'\x1f\x8b', gzip),
+    (b'BZh', bz2),
+    (b'\xfd7zXZ\x00', lzma),
+)
+
+COMPRESSION_EXTENSIONS = {
+    '.gz': gzip,
+    '.bz2': bz2,
+    '.xz': lzma,
+}
+
+def detect_compression(filename: str, mode: str = 'r'):
+    """
+    Определение модуля сжатия для файла
+
+    При чтении формат определяется по сигнатуре в начале файла, при записи
+    (или если файл ещё не существует либо короче любой сигнатуры, например
+    только что создан другим процессом) - по расширению имени файла.
+
+    Args:
+        filename (str): Путь к файлу
+        mode (str): Режим открытия ('r', 'w' или 'a')
+
+    Returns:
+        Модуль gzip, bz2 или lzma, либо None для несжатого файла
+    """
+    if mode.startswith('r'):
+        try:
+            with open(filename, 'rb') as file:
+                header = file.read(6)
+            if len(header) >= min(len(magic) for magic, _ in COMPRESSION_MAGIC):
+                for magic, module in COMPRESSION_MAGIC:
+                    if header.startswith(magic):
+                        return module
+                return None
+        except FileNotFoundError:
+            pass
+    for extension, module in COMPRESSION_EXTENSIONS.items():
+        if filename.lower().endswith(extension):
+            return module
+    return None
+
+def open_text_file(filename: str, mode: str = 'r', encoding: str | None = 'utf-8', errors: str | None = None):
+    """
+    Открытие текстового файла с прозрачной потоковой (раз)архивацией
+
+    Поддерживаются файлы .gz, .bz2 и .xz; данные распаковываются по мере
+    чтения, без создания временных файлов.
+
+    Args:
+        filename (str): Путь к файлу
+        mode (str): Режим открытия ('r', 'w' или 'a')
+        encoding (str | None): Кодировка текста (None - кодировка системы по умолчанию)
+        errors (str | None): Обработка ошибок кодировки, как у open (None - исключение)
+
+    Returns:
+        Текстовый файловый объект
+    """
+    module = detect_compression(filename, mode)
+    if module is None:
+        return open(filename, mode, encoding=encoding, errors=errors)
+    return module.open(filename, mode.rstrip('t') + 't', encoding=encoding, errors=errors)
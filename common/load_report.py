@@ -0,0 +1,108 @@
+import re
+
+# Тексты сводки: Lab1 и Lab2 выводят сообщения по-английски, Lab3 - по-русски
+MESSAGES = {
+    "ru": {
+        "budget": "Превышено допустимое число ошибочных строк ({budget}). {summary}",
+        "totals": "Принято строк: {accepted}, отклонено: {rejected}",
+        "example": "    строка {line_number}: {line} ({message})",
+        "example_without_line": "    строка {line_number}: {message}",
+    },
+    "en": {
+        "budget": "Too many invalid lines (budget {budget}). {summary}",
+        "totals": "Accepted lines: {accepted}, rejected: {rejected}",
+        "example": "    line {line_number}: '{line}' ({message})",
+        "example_without_line": "    line {line_number}: {message}",
+    },
+}
+
+class ErrorBudgetExceeded(ValueError):
+    """Исключение при превышении допустимого числа ошибочных строк"""
+
+class LoadReport:
+    """
+    Класс для сводки об ошибках массовой загрузки
+
+    Считает отклонённые строки по причинам и хранит только первые
+    max_examples примеров каждой причины, поэтому повреждённый файл не
+    засоряет лог. При заданном error_budget загрузка прерывается, как
+    только число ошибок его превысит.
+    """
+
+    def __init__(self, max_examples: int = 5, error_budget: int | None = None, language: str = "ru"):
+        """
+        Инициализация пустой сводки
+
+        Args:
+            max_examples (int): Сколько примеров хранить для каждой причины
+            error_budget (int | None): Допустимое число ошибочных строк (None - без ограничения)
+            language (str): Язык сводки: "ru" или "en"
+        """
+        if language not in MESSAGES:
+            raise ValueError(f"Неизвестный язык сводки: {language}")
+        self.max_examples = max_examples
+        self.error_budget = error_budget
+        self.messages = MESSAGES[language]
+        self.accepted = 0
+        self.rejected = 0
+        self.reasons = {}
+        self.examples = {}
+
+    @staticmethod
+    def reason_of(error: Exception | str) -> str:
+        """
+        Получение причины ошибки без конкретных значений из строки
+
+        Args:
+            error (Exception | str): Ошибка разбора
+
+        Returns:
+            str: Причина, общая для однотипных ошибок
+        """
+        message = str(error).split(':')[0]
+        return re.sub(r"'[^']*'", "'…'", message)
+
+    def record_accepted(self, count: int = 1) -> None:
+        """
+        Учёт принятых строк
+
+        Args:
+            count (int): Количество строк
+        """
+        self.accepted += count
+
+    def record_rejected(self, line_number: int, line: str, error: Exception | str) -> None:
+        """
+        Учёт отклонённой строки
+
+        Args:
+            line_number (int): Номер строки
+            line (str): Содержимое строки
+            error (Exception | str): Ошибка разбора
+
+        Raises:
+            ErrorBudgetExceeded: Если число ошибок превысило error_budget
+        """
+        self.rejected += 1
+        reason = self.reason_of(error)
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        examples = self.examples.setdefault(reason, [])
+        if len(examples) < self.max_examples:
+            examples.append((line_number, line, str(error)))
+        if self.error_budget is not None and self.rejected > self.error_budget:
+            raise ErrorBudgetExceeded(self.messages["budget"].format(budget=self.error_budget, summary=self.summary()))
+
+    def summary(self) -> str:
+        """
+        Получение текстовой сводки
+
+        Returns:
+            str: Число принятых и отклонённых строк и примеры по причинам
+        """
+        lines = [self.messages["totals"].format(accepted=self.accepted, rejected=self.rejected)]
+        for reason, count in sorted(self.reasons.items(), key=lambda item: -item[1]):
+            lines.append(f"  {reason}: {count}")
+            for line_number, line, message in self.examples[reason]:
+                template = self.messages["example"] if line else self.messages["example_without_line"]
+                lines.append(template.format(line_number=line_number, line=line, message=message))
+        return "\n".join(lines)